@@ -1,4 +1,6 @@
 import streamlit as st
+import threading
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # Page configuration
 st.set_page_config(
@@ -9,8 +11,38 @@ st.set_page_config(
 
 # Load CSS
 from css_loader import load_css
+from utils import Lazy
 load_css()
 
+# Main Header & Layout
+# Reserve the ticker slot so the static header is flushed before the data layer is imported
+ticker_slot = st.empty()
+
+# Header (static markup; re-emitting identical content lets the frontend reuse the existing DOM)
+HEADER_HTML = """
+<div class="glass-header">
+<div class="header-top-row">
+<div class="logo-group">
+<!-- Company Logo -->
+<img class="logo-container" src="https://raw.githubusercontent.com/Tarikul-Islam-Anik/Animated-Fluent-Emojis/master/Emojis/Objects/Chart%20Increasing.png">
+<h1 class="header-title">BuffettBrain <span class="beta-badge">BETA</span></h1>
+</div>
+<div class="status-pill success" style="margin-top: 0;">● System Online</div>
+</div>
+<div class="header-notes-box">
+<div class="note-item">
+<span class="note-label">IMPORTANT:</span>
+<span>Use exact <strong>Stock Ticker Name</strong> (e.g., RELIANCE.NS).</span>
+</div>
+<div class="note-item">
+<span>This site is a <strong>Beta Version</strong> following Buffett & Graham principles. <strong>Not a recommendation.</strong></span>
+</div>
+</div>
+</div>
+"""
+
+st.markdown(HEADER_HTML, unsafe_allow_html=True)
+
 # Initialize session state with cached resources
 @st.cache_resource
 def get_data_fetcher():
@@ -22,124 +54,108 @@ def get_analyzer():
     from stock_analyzer import StockAnalyzer
     return StockAnalyzer()
 
+# Constructed on first use, so reruns that never touch them skip the import + init cost
 if 'data_fetcher' not in st.session_state:
-    st.session_state.data_fetcher = get_data_fetcher()
+    st.session_state.data_fetcher = Lazy(get_data_fetcher)
 if 'analyzer' not in st.session_state:
-    st.session_state.analyzer = get_analyzer()
+    st.session_state.analyzer = Lazy(get_analyzer)
 if 'watchlist' not in st.session_state:
     st.session_state.watchlist = []
 
-# Main Header & Layout
-# Fetch live index data
+# Fetch live index data in the background on first load so the header and sidebar render while it is in flight
+indices_thread = None
 if 'market_indices' not in st.session_state:
-    st.session_state.market_indices = st.session_state.data_fetcher.get_market_indices()
-
-# Generate HTML for ticker dynamically
-ticker_html_items = ""
-for item in st.session_state.market_indices:
-    color_class = "ticker-up" if item['change'] >= 0 else "ticker-down"
-    arrow = "▲" if item['change'] >= 0 else "▼"
-    price_fmt = f"{item['currency']}{item['price']:,.2f}"
-    change_fmt = f"{arrow} {abs(item['change']):.2f}%"
-    ticker_html_items += f"""<div class="ticker__item"><span class="ticker-symbol">{item['name']}</span> <span class="{color_class}">{price_fmt} {change_fmt}</span></div>"""
-
-# Duplicate for infinite scroll
-ticker_full_html = ticker_html_items + ticker_html_items
-
-st.markdown(f"""
+    indices_result = {}
+
+    def _fetch_indices(fetcher=st.session_state.data_fetcher):
+        indices_result['data'] = fetcher.get_market_indices()
+
+    indices_thread = threading.Thread(target=_fetch_indices, daemon=True)
+    add_script_run_ctx(indices_thread, get_script_run_ctx())
+    indices_thread.start()
+
+# Generate HTML for ticker dynamically (cached, so reruns re-emit the prebuilt string)
+# Indexed by (change >= 0): False -> down, True -> up
+TICKER_COLOR_CLASS = ("ticker-down", "ticker-up")
+TICKER_ARROW = ("▼", "▲")
+
+def _ticker_item(name, price, chg, cls, arrow, cur):
+    # Positional args keep every field a fast local instead of a per-item dict lookup
+    return f'<div class="ticker__item"><span class="ticker-symbol">{name}</span> <span class="{cls}">{cur}{price:,.2f} {arrow} {chg:.2f}%</span></div>'
+
+@st.cache_data(ttl=60, show_spinner=False)
+def build_ticker_html(indices: tuple) -> str:
+    """Render the scrolling ticker from a hashable (name, price, change, currency) snapshot"""
+    parts = []
+    for name, price, change, currency in indices:
+        is_up = change >= 0
+        parts.append(_ticker_item(name, price, abs(change), TICKER_COLOR_CLASS[is_up], TICKER_ARROW[is_up], currency))
+    # Items are rendered once; the CSS marquee loops them without duplicating DOM nodes
+    ticker_html_items = "".join(parts)
+
+    return f"""
 <div class="ticker-wrap">
 <div class="ticker">
-  {ticker_full_html}
+  {ticker_html_items}
 </div>
 </div>
-""", unsafe_allow_html=True)
-
-# Load logos
-import base64
-
-def get_base64_of_bin_file(bin_file):
-    try:
-        with open(bin_file, 'rb') as f:
-            data = f.read()
-        return base64.b64encode(data).decode()
-    except:
-        return ""
-
-user_logo_b64 = get_base64_of_bin_file("Logo/Logo - Copy.png")
-
-# Header
-st.markdown(f"""
-<div class="glass-header">
-<div class="header-top-row">
-<div class="logo-group">
-<!-- Company Logo -->
-<div class="logo-container">
-<img src="https://raw.githubusercontent.com/Tarikul-Islam-Anik/Animated-Fluent-Emojis/master/Emojis/Objects/Chart%20Increasing.png" width="45">
-</div>
-<div>
-<h1 class="header-title">BuffettBrain <span class="beta-badge">BETA</span></h1>
-</div>
-</div>
-<div class="status-pill success" style="margin-top: 0;">● System Online</div>
-</div>
-<div class="header-notes-box">
-<div class="note-item">
-<span class="note-label">IMPORTANT:</span>
-<span>Use exact <strong>Stock Ticker Name</strong> (e.g., RELIANCE.NS).</span>
-</div>
-<div class="note-item">
-<span>This site is a <strong>Beta Version</strong> following Buffett & Graham principles. <strong>Not a recommendation.</strong></span>
-</div>
-</div>
-</div>
-""", unsafe_allow_html=True)
+"""
+
+def render_ticker():
+    snapshot = tuple(
+        (item['name'], item['price'], item['change'], item['currency'])
+        for item in st.session_state.market_indices
+    )
+    # Reuse this session's HTML while the indices are unchanged (skips the cache_data hash/lookup)
+    snapshot_hash = hash(snapshot)
+    if st.session_state.get('_ticker_hash') != snapshot_hash or '_ticker_html' not in st.session_state:
+        st.session_state._ticker_html = build_ticker_html(snapshot)
+        st.session_state._ticker_hash = snapshot_hash
+    ticker_slot.markdown(st.session_state._ticker_html, unsafe_allow_html=True)
+
+if indices_thread is None:
+    render_ticker()
 
 # Removed: INITIALIZING QUANT DATA STREAMS block as requested
 
 
-# Clean sidebar with only essential items
-with st.sidebar:
+# Set default page
+if 'page' not in st.session_state:
+    st.session_state.page = "single"
+
+# Sidebar and page run as fragments: their interactions rerun only their own block,
+# leaving the header, ticker and footer untouched
+@st.fragment
+def nav_fragment():
     st.markdown("## 🧭 Navigation")
     
     # Simple page selection
     if st.button("🔍 Single Stock Analysis", use_container_width=True):
         st.session_state.page = "single"
         st.rerun()
-    
 
+# Clean sidebar with only essential items
+with st.sidebar:
+    nav_fragment()
 
-# Set default page
-if 'page' not in st.session_state:
-    st.session_state.page = "single"
+# Ticker streams in once the background fetch completes, before the page body starts its own fetches
+if indices_thread is not None:
+    indices_thread.join()
+    st.session_state.market_indices = indices_result.get('data', [])
+    render_ticker()
 
 # Page routing
 if st.session_state.page == "single":
     from pages.page_single_stock import main
-    main()
+    st.fragment(main)()
 
 
 # Footer (Static at bottom)
-user_img_tag = f'<img src="data:image/png;base64,{user_logo_b64}" style="height: 30px; width: 30px; border-radius: 50%; vertical-align: middle; border: 1px solid var(--neon-blue); box-shadow: 0 0 5px var(--neon-blue); margin-left: 8px;">' if user_logo_b64 else ""
-
-st.markdown(f"""
-<style>
-.app-footer {{
-    width: 100%;
-    background: rgba(15, 23, 42, 0.98);
-    border-top: 1px solid var(--neon-blue);
-    color: var(--text-dim);
-    text-align: center;
-    padding: 30px 20px;
-    font-size: 0.85rem;
-    margin-top: 60px;
-    backdrop-filter: blur(10px);
-    box-shadow: 0 -5px 20px rgba(0,0,0,0.5);
-}}
-.app-footer p {{ margin: 0; line-height: 1.6; }}
-</style>
+# Logo is served by Streamlit static file serving (see .streamlit/config.toml); footer styles live in styles.css
+FOOTER_HTML = """
 <div class="app-footer">
 <p style="margin-bottom: 8px;">
-<span style="color: #fff; font-weight: bold;">Creator of site:</span> <span style="color: var(--neon-blue); font-weight: bold; font-size: 1rem;">Dev Jasani</span> {user_img_tag}
+<span style="color: #fff; font-weight: bold;">Creator of site:</span> <span style="color: var(--neon-blue); font-weight: bold; font-size: 1rem;">Dev Jasani</span> <img src="app/static/Logo%20-%20Copy.png" style="height: 30px; width: 30px; border-radius: 50%; vertical-align: middle; border: 1px solid var(--neon-blue); box-shadow: 0 0 5px var(--neon-blue); margin-left: 8px;">
 </p>
 
 <!-- Social Links -->
@@ -164,4 +180,6 @@ Do not use score as recommendation. It is just used to identify <span style="col
 <span style="color: var(--error);">Quality stocks can face losses. Not a buy recommendation.</span>
 </p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+"""
+
+st.markdown(FOOTER_HTML, unsafe_allow_html=True)
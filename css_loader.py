@@ -2,11 +2,16 @@
 import streamlit as st
 import os
 
+@st.cache_data(show_spinner=False)
+def _read_css(css_file, mtime):
+    """Read the stylesheet once per file version (mtime is part of the cache key)"""
+    with open(css_file, "r") as f:
+        return f"<style>{f.read()}</style>"
+
 def load_css(css_file="styles.css"):
     """Load CSS from external file"""
     try:
-        with open(css_file, "r") as f:
-            css_content = f.read()
-            st.markdown(f"<style>{css_content}</style>", unsafe_allow_html=True)
+        css_html = _read_css(css_file, os.path.getmtime(css_file))
+        st.markdown(css_html, unsafe_allow_html=True)
     except FileNotFoundError:
-        st.error(f"CSS file '{css_file}' not found. Using default styles.")
\ No newline at end of file
+        st.error(f"CSS file '{css_file}' not found. Using default styles.")
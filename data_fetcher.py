@@ -1,13 +1,78 @@
 # data_fetcher.py
 import yfinance as yf
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, Optional, List, Tuple
 import re
-from difflib import SequenceMatcher
+import functools
+import heapq
+from operator import itemgetter
+from rapidfuzz import process, fuzz
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Query normalization runs on every search keystroke, so keep its pieces precompiled
+_WHITESPACE_RE = re.compile(r'\s+')
+_EXCHANGE_SUFFIXES = ('.nse', '.bse', '.ns', '.bo')
+
+# Yahoo requests are I/O-bound; one worker per statement lets a symbol's round-trips overlap
+_FETCH_POOL = ThreadPoolExecutor(max_workers=6, thread_name_prefix="yf-fetch")
+
+# Pooled keep-alive session for our direct Yahoo HTTP calls (search API).
+# yfinance already shares one curl_cffi session across all Ticker objects, and Yahoo
+# rejects plain requests sessions there, so Ticker calls keep yfinance's own session.
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=40))
+HTTP_SESSION.headers.update({'User-Agent': 'Mozilla/5.0'})
+
+# Last response per chart URL: (conditional-request headers, parsed JSON).
+# Only the fixed set of index URLs goes through here, so it stays small.
+_REVALIDATED_JSON: Dict[str, Tuple[Dict[str, str], Any]] = {}
+
+# Financial statements only change quarterly: keep them on disk for a day, across restarts
+STATEMENTS_TTL_SECONDS = 24 * 60 * 60
+
+class _EmptyStatements(Exception):
+    """Raised so that empty (possibly failed) statement downloads are not persisted"""
+
+# Each symbol gets a fresh key every day, so bound the entries kept for the persisted cache
+STATEMENTS_MAX_ENTRIES = 256
+
+# ttl_bucket last used for statements; None until the first fetch in this process
+_statements_bucket: Optional[int] = None
+
+@st.cache_data(persist="disk", max_entries=STATEMENTS_MAX_ENTRIES, show_spinner=False)
+def fetch_symbol_statements(symbol: str, ttl_bucket: int) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch annual financials, balance sheet and cash flow (Disk Cached).
+    Persisted caches ignore ttl, so ttl_bucket (time // STATEMENTS_TTL_SECONDS) rotates the key instead.
+    """
+    ticker = yf.Ticker(symbol)
+    futures = {
+        'financials': _FETCH_POOL.submit(lambda: ticker.financials),
+        'balance_sheet': _FETCH_POOL.submit(lambda: ticker.balance_sheet),
+        'cashflow': _FETCH_POOL.submit(lambda: ticker.cashflow),
+    }
+    statements = {key: future.result() for key, future in futures.items()}
+    
+    if all(df is None or df.empty for df in statements.values()):
+        raise _EmptyStatements(symbol)
+    return statements
+
+def _current_statements_bucket() -> int:
+    """Today's statements ttl_bucket; when the day rolls over, yesterday's persisted entries are cleared"""
+    global _statements_bucket
+    bucket = int(time.time() // STATEMENTS_TTL_SECONDS)
+    if _statements_bucket is not None and bucket != _statements_bucket:
+        # Old buckets can never be hit again, and persisted entries are not expired by ttl
+        fetch_symbol_statements.clear()
+    _statements_bucket = bucket
+    return bucket
 
 @st.cache_data(ttl=300, show_spinner=False)
 def fetch_symbol_data(symbol: str) -> Optional[Dict[str, Any]]:
@@ -20,31 +85,38 @@ def fetch_symbol_data(symbol: str) -> Optional[Dict[str, Any]]:
         try:
             ticker = yf.Ticker(symbol)
             
-            # 1. Fetch Basic Info
-            info = ticker.info
+            # Fire the quote requests concurrently: info, 1y history, holders
+            futures = {
+                'info': _FETCH_POOL.submit(lambda: ticker.info),
+                'history': _FETCH_POOL.submit(ticker.history, period="1y"),
+                'major_holders': _FETCH_POOL.submit(lambda: ticker.major_holders),
+            }
             
-            # 2. Fetch History (1y)
-            hist = ticker.history(period="1y")
+            info = futures['info'].result()
+            hist = futures['history'].result()
             
             if hist.empty and not info:
                 # If both fail, likely invalid symbol or network issue
+                for future in futures.values():
+                    future.cancel()
                 if attempt < max_retries - 1:
                     time.sleep(1)
                     continue
                 return None
             
-            # 3. Fetch Financials (safely)
-            financials = ticker.financials
-            balance_sheet = ticker.balance_sheet
-            cashflow = ticker.cashflow
-            major_holders = ticker.major_holders
+            # Statements come from the day-long disk cache (fetched concurrently on a miss),
+            # only once info/history show the symbol is real
+            try:
+                statements = fetch_symbol_statements(symbol, _current_statements_bucket())
+            except _EmptyStatements:
+                statements = {'financials': pd.DataFrame(), 'balance_sheet': pd.DataFrame(), 'cashflow': pd.DataFrame()}
+            
+            major_holders = futures['major_holders'].result()
             
             return {
                 'info': info,
                 'history': hist,
-                'financials': financials,
-                'balance_sheet': balance_sheet,
-                'cashflow': cashflow,
+                **statements,
                 'major_holders': major_holders
             }
             
@@ -56,6 +128,36 @@ def fetch_symbol_data(symbol: str) -> Optional[Dict[str, Any]]:
             return None
     return None
 
+def _get_json_revalidated(url: str) -> Any:
+    """GET a JSON document, revalidating the last copy with ETag/Last-Modified when the server sent them"""
+    cached = _REVALIDATED_JSON.get(url)
+    headers = cached[0] if cached else {}
+    try:
+        response = HTTP_SESSION.get(url, headers=headers, timeout=5)
+        if response.status_code == 304 and cached:
+            return cached[1]
+        response.raise_for_status()
+    except requests.RequestException:
+        # Serve the last good copy rather than dropping the entry
+        if cached:
+            return cached[1]
+        raise
+    
+    body = response.json()
+    validators = {}
+    if response.headers.get('ETag'):
+        validators['If-None-Match'] = response.headers['ETag']
+    if response.headers.get('Last-Modified'):
+        validators['If-Modified-Since'] = response.headers['Last-Modified']
+    _REVALIDATED_JSON[url] = (validators, body)
+    return body
+
+def _fetch_chart_closes(symbol: str, period: str) -> List[float]:
+    """Daily closes for a symbol from Yahoo's chart endpoint, skipping missing bars"""
+    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?range={period}&interval=1d"
+    quote = _get_json_revalidated(url)['chart']['result'][0]['indicators']['quote'][0]
+    return [close for close in quote.get('close', []) if close is not None]
+
 @st.cache_data(ttl=60, show_spinner=False)
 def fetch_market_indices() -> List[Dict[str, Any]]:
     """Fetch live data for major market indices (Standalone Cached)"""
@@ -68,15 +170,19 @@ def fetch_market_indices() -> List[Dict[str, Any]]:
         {'symbol': 'BTC-USD', 'name': 'BITCOIN', 'currency': '$'},
     ]
     
+    # Only the last two closes are needed, so read them straight from the chart JSON
+    # rather than building a DataFrame. 5d rather than 2d covers weekends/holidays.
+    futures = {index['symbol']: _FETCH_POOL.submit(_fetch_chart_closes, index['symbol'], "5d")
+               for index in indices}
+    
     results = []
     for index in indices:
         try:
-            ticker = yf.Ticker(index['symbol'])
-            hist = ticker.history(period="2d")
+            closes = futures[index['symbol']].result()
             
-            if not hist.empty:
-                current = hist['Close'].iloc[-1]
-                prev = hist['Close'].iloc[-2] if len(hist) > 1 else current
+            if closes:
+                current = closes[-1]
+                prev = closes[-2] if len(closes) > 1 else current
                 change = ((current - prev) / prev) * 100
                 
                 results.append({
@@ -90,6 +196,116 @@ def fetch_market_indices() -> List[Dict[str, Any]]:
             
     return results
 
+@st.cache_data(ttl=120, show_spinner=False)
+def fetch_yahoo_search(query: str) -> List[Dict[str, str]]:
+    """
+    Search using Yahoo Finance API (Standalone Cached).
+    Errors propagate so that failed lookups are not cached.
+    """
+    url = f"https://query2.finance.yahoo.com/v1/finance/search?q={query}"
+    suggestions = []
+    
+    response = HTTP_SESSION.get(url, timeout=5)
+    data = response.json()
+    
+    if 'quotes' in data:
+        for quote in data['quotes']:
+            # Only include stocks and ETFs
+            if quote.get('quoteType') in ['EQUITY', 'ETF', 'MUTUALFUND']:
+                symbol = quote.get('symbol')
+                shortname = quote.get('shortname') or quote.get('longname') or symbol
+                exch = quote.get('exchange', '')
+                
+                # Add to suggestions
+                suggestions.append({
+                    'name': shortname,
+                    'symbol': symbol,
+                    'score': 0.9 if query.lower() in shortname.lower() or query.lower() in symbol.lower() else 0.7,
+                    'exchange': exch
+                })
+    
+    return suggestions
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_stock_with_suggestions(_fetcher: "DataFetcher", query: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, str]]]:
+    """
+    Resolve a query to stock data, or to suggestions when it does not match (Standalone Cached).
+    Keyed on the query alone: the leading underscore keeps _fetcher out of the cache key.
+    """
+    return _fetcher._lookup_stock_with_suggestions(query)
+
+# stock_data key -> (Yahoo info key, default)
+_INFO_FIELDS = {
+    # Basic info
+    'long_name': ('longName', ''),
+    'short_name': ('shortName', ''),
+    'business_summary': ('longBusinessSummary', ''),
+    'industry': ('industry', ''),
+    'sector': ('sector', ''),
+    'exchange': ('exchange', ''),
+    'currency': ('currency', 'USD'),
+    
+    # Market data
+    'market_cap': ('marketCap', 0),
+    'shares_outstanding': ('sharesOutstanding', 0),
+    'float_shares': ('floatShares', 0),
+    'volume': ('volume', 0),
+    'avg_volume': ('averageVolume', 0),
+    
+    # Valuation ratios
+    'pe_ratio': ('trailingPE', 0),
+    'forward_pe': ('forwardPE', 0),
+    'pb_ratio': ('priceToBook', 0),
+    'ps_ratio': ('priceToSalesTrailing12Months', 0),
+    'peg_ratio': ('pegRatio', 0),
+    'enterprise_value': ('enterpriseValue', 0),
+    'ev_revenue': ('enterpriseToRevenue', 0),
+    'ev_ebitda': ('enterpriseToEbitda', 0),
+    
+    # Financial metrics
+    'book_value': ('bookValue', 0),
+    'eps': ('trailingEps', 0),
+    'forward_eps': ('forwardEps', 0),
+    'beta': ('beta', 1.0),
+    
+    # Dividend data
+    'dividend_rate': ('dividendRate', 0),
+    'dividend_yield': ('dividendYield', 0),
+    'payout_ratio': ('payoutRatio', 0),
+    'ex_dividend_date': ('exDividendDate', None),
+}
+
+# stock_data key -> Yahoo info key, defaulting to the current price
+_PRICE_INFO_FIELDS = {
+    'previous_close': 'previousClose',
+    'open_price': 'open',
+    'day_low': 'dayLow',
+    'day_high': 'dayHigh',
+    'fifty_two_week_low': 'fiftyTwoWeekLow',
+    'fifty_two_week_high': 'fiftyTwoWeekHigh',
+}
+
+# Exchange suffix -> market/country; symbols without a known suffix are treated as US
+_SUFFIX_TO_MARKET = {
+    '.NS': 'India', '.BO': 'India',
+    '.L': 'UK',
+    '.HK': 'Hong Kong',
+    '.T': 'Japan', '.JP': 'Japan',
+    '.AX': 'Australia',
+    '.SA': 'Brazil',
+    '.TO': 'Canada',
+}
+
+# Statement fields that must always be present in the processed financial data
+_FINANCIAL_DEFAULTS = {
+    'total_revenue': 0, 'operating_income': 0, 'net_income': 0, 'ebitda': 0,
+    'total_assets': 0, 'total_debt': 0, 'total_stockholder_equity': 0,
+    'total_current_assets': 0, 'total_current_liabilities': 0,
+    'operating_cash_flow': 0, 'free_cash_flow': 0, 'capital_expenditures': 0,
+    'revenue_growth': 8.0, 'earnings_growth': 10.0,
+    'revenue_growth_years': 0, 'earnings_growth_years': 0
+}
+
 class DataFetcher:
     def __init__(self):
         self.indian_stock_suffixes = ['.NS', '.BO']  # NSE and BSE
@@ -154,6 +370,16 @@ class DataFetcher:
             'vedl': 'VEDL.NS',
             'vedanta': 'VEDL.NS'
         }
+        
+        # Fuzzy-search choices, in dict order, scored in one vectorized rapidfuzz call per query
+        self._stock_names = list(self.common_indian_stocks)
+        self._known_symbols = frozenset(self.common_indian_stocks.values())
+        
+        # Symbol -> display name, preferring the longest (most descriptive) alias
+        self._symbol_to_name = {}
+        for name, symbol in self.common_indian_stocks.items():
+            if len(name) > len(self._symbol_to_name.get(symbol, '')):
+                self._symbol_to_name[symbol] = name.title()
     
     def get_stock_data(self, query: str) -> Optional[Dict[str, Any]]:
         """
@@ -161,11 +387,15 @@ class DataFetcher:
         Accepts various input formats: ticker, company name, etc.
         """
         
-        # Clean and normalize the query
-        normalized_query = self._normalize_query(query)
+        # Exchange-qualified or known symbols are used as typed, skipping the validation round-trips
+        symbol = self._direct_symbol(query)
         
-        # Try to find the stock symbol
-        symbol = self._find_stock_symbol(normalized_query)
+        if not symbol:
+            # Clean and normalize the query
+            normalized_query = self._normalize_query(query)
+            
+            # Try to find the stock symbol
+            symbol = self._find_stock_symbol(normalized_query)
         
         if not symbol:
             return None
@@ -186,9 +416,17 @@ class DataFetcher:
             # Get financial data (pass the pre-fetched dfs)
             financials = self._process_financial_data(data_bundle)
             
+            # Read the info-backed fields once; currency and previous close are reused below
+            info_fields = {key: info.get(src, default) for key, (src, default) in _INFO_FIELDS.items()}
+            price_fields = {key: info.get(src, current_price) for key, src in _PRICE_INFO_FIELDS.items()}
+            
+            # The history's second-to-last close is fresher than info's previousClose
+            if len(hist) > 1:
+                price_fields['previous_close'] = hist['Close'].iloc[-2]
+            
             # Determine market and currency symbol
             market = self.get_market_from_symbol(symbol)
-            currency_code = info.get('currency', 'USD')
+            currency_code = info_fields['currency']
             currency_symbol = self.get_currency_symbol(currency_code, market)
             
             # Fetch Promoter/Insider Holding with Fallback calculation
@@ -216,56 +454,23 @@ class DataFetcher:
                     pass
 
             # Compile comprehensive stock data
+            # Growth inputs shared by the value and year-count fields below
+            has_revenue_cagr = financials['revenue_growth_years'] >= 2
+            has_earnings_cagr = financials['earnings_growth_years'] >= 2
+            info_revenue_growth = info.get('revenueGrowth')
+            info_earnings_growth = info.get('earningsGrowth') or info.get('earningsQuarterlyGrowth')
+            
             stock_data = {
-                # Basic info
                 'symbol': symbol,
-                'long_name': info.get('longName', ''),
-                'short_name': info.get('shortName', ''),
-                'business_summary': info.get('longBusinessSummary', ''),
-                'industry': info.get('industry', ''),
-                'sector': info.get('sector', ''),
-                'exchange': info.get('exchange', ''),
-                'currency': info.get('currency', 'USD'),
                 'currency_symbol': currency_symbol,
                 'market': market,
-                
-                # Price data
                 'current_price': current_price,
-                'previous_close': info.get('previousClose', current_price),
-                'open_price': info.get('open', current_price),
-                'day_low': info.get('dayLow', current_price),
-                'day_high': info.get('dayHigh', current_price),
-                'fifty_two_week_low': info.get('fiftyTwoWeekLow', current_price),
-                'fifty_two_week_high': info.get('fiftyTwoWeekHigh', current_price),
-                
-                # Market data
-                'market_cap': info.get('marketCap', 0),
-                'shares_outstanding': info.get('sharesOutstanding', 0),
-                'float_shares': info.get('floatShares', 0),
-                'volume': info.get('volume', 0),
-                'avg_volume': info.get('averageVolume', 0),
                 
-                # Valuation ratios
-                'pe_ratio': info.get('trailingPE', 0),
-                'forward_pe': info.get('forwardPE', 0),
-                'pb_ratio': info.get('priceToBook', 0),
-                'ps_ratio': info.get('priceToSalesTrailing12Months', 0),
-                'peg_ratio': info.get('pegRatio', 0),
-                'enterprise_value': info.get('enterpriseValue', 0),
-                'ev_revenue': info.get('enterpriseToRevenue', 0),
-                'ev_ebitda': info.get('enterpriseToEbitda', 0),
+                # Basic info, market data, valuation ratios, financial metrics, dividends
+                **info_fields,
                 
-                # Financial metrics
-                'book_value': info.get('bookValue', 0),
-                'eps': info.get('trailingEps', 0),
-                'forward_eps': info.get('forwardEps', 0),
-                'beta': info.get('beta', 1.0),
-                
-                # Dividend data
-                'dividend_rate': info.get('dividendRate', 0),
-                'dividend_yield': info.get('dividendYield', 0),
-                'payout_ratio': info.get('payoutRatio', 0),
-                'ex_dividend_date': info.get('exDividendDate', None),
+                # Price data
+                **price_fields,
                 
                 # Promoter/Insider Holding
                 # Yahoo Finance uses 'heldPercentInsiders' for promoter/insider holding (0.72 = 72%)
@@ -276,13 +481,13 @@ class DataFetcher:
                 **financials,
                 
                 # Growth metrics: Prefer 5-year CAGR from financials, fallback to YoY info
-                'revenue_growth': financials.get('revenue_growth') if financials.get('revenue_growth_years', 0) >= 2 else (info.get('revenueGrowth', 0) or 0) * 100,
-                'earnings_growth': financials.get('earnings_growth') if financials.get('earnings_growth_years', 0) >= 2 else (info.get('earningsGrowth', 0) or info.get('earningsQuarterlyGrowth', 0) or 0) * 100,
-                'revenue_growth_years': financials.get('revenue_growth_years') if financials.get('revenue_growth_years', 0) >= 2 else (1 if info.get('revenueGrowth') else 0),
-                'earnings_growth_years': financials.get('earnings_growth_years') if financials.get('earnings_growth_years', 0) >= 2 else (1 if info.get('earningsGrowth') or info.get('earningsQuarterlyGrowth') else 0),
+                'revenue_growth': financials['revenue_growth'] if has_revenue_cagr else (info_revenue_growth or 0) * 100,
+                'earnings_growth': financials['earnings_growth'] if has_earnings_cagr else (info_earnings_growth or 0) * 100,
+                'revenue_growth_years': financials['revenue_growth_years'] if has_revenue_cagr else (1 if info_revenue_growth else 0),
+                'earnings_growth_years': financials['earnings_growth_years'] if has_earnings_cagr else (1 if info_earnings_growth else 0),
                 
                 # Calculated fields
-                'change_percent': self._calculate_change_percent(current_price, info.get('previousClose', current_price)),
+                'change_percent': self._calculate_change_percent(current_price, price_fields['previous_close']),
                 'history': hist  # Expose full history for charts
             }
             
@@ -339,19 +544,27 @@ class DataFetcher:
         
         return market_currency_map.get(market, '$')
     
-    def _normalize_query(self, query: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _normalize_query(query: str) -> str:
         """Normalize the input query for better matching"""
         # Convert to lowercase and remove extra spaces
-        normalized = re.sub(r'\s+', ' ', query.lower().strip())
+        normalized = _WHITESPACE_RE.sub(' ', query.lower().strip())
         
-        # Remove common suffixes if present
-        for suffix in ['.ns', '.bo', '.nse', '.bse']:
-            if normalized.endswith(suffix):
-                normalized = normalized[:-len(suffix)]
-                break
+        # Remove common suffixes if present (each is a single dot-extension)
+        if normalized.endswith(_EXCHANGE_SUFFIXES):
+            normalized = normalized.rsplit('.', 1)[0]
         
         return normalized
     
+    def _direct_symbol(self, query: str) -> Optional[str]:
+        """Return the query as a symbol if it is already exchange-qualified or one of ours"""
+        candidate = query.strip().upper()
+        dot = candidate.rfind('.')
+        if candidate in self._known_symbols or (dot > 0 and candidate[dot:] in _SUFFIX_TO_MARKET):
+            return candidate
+        return None
+    
     def _find_stock_symbol(self, query: str) -> Optional[str]:
         """Find the appropriate stock symbol for the query"""
         
@@ -371,9 +584,12 @@ class DataFetcher:
             f"{query.upper()}.BO"
         ]
         
-        # Test each possible symbol
-        for symbol in possible_symbols:
-            if self._validate_symbol(symbol):
+        # Probe all variants concurrently, but keep the bare > .NS > .BO preference order
+        futures = [_FETCH_POOL.submit(self._validate_symbol, symbol) for symbol in possible_symbols]
+        for symbol, future in zip(possible_symbols, futures):
+            if future.result():
+                for pending in futures:
+                    pending.cancel()
                 return symbol
         
         return None
@@ -407,51 +623,39 @@ class DataFetcher:
             cash_flow = data_bundle.get('cashflow', pd.DataFrame())
             
             if not financials.empty:
+                # Positional access: one label->row map and the raw 2-D array per statement
+                fin_idx, fin_values = self._row_index(financials)
+                
+                def fin_val(row, col=0):
+                    return fin_values[fin_idx[row], col] if row in fin_idx else 0
+                
                 # Income statement items (most recent year)
-                latest_col = financials.columns[0]
                 financial_data.update({
-                    'total_revenue': financials.loc['Total Revenue', latest_col] if 'Total Revenue' in financials.index else 0,
-                    'operating_income': financials.loc['Operating Income', latest_col] if 'Operating Income' in financials.index else 0,
-                    'net_income': financials.loc['Net Income', latest_col] if 'Net Income' in financials.index else 0,
-                    'ebitda': financials.loc['EBITDA', latest_col] if 'EBITDA' in financials.index else 0,
+                    'total_revenue': fin_val('Total Revenue'),
+                    'operating_income': fin_val('Operating Income'),
+                    'net_income': fin_val('Net Income'),
+                    'ebitda': fin_val('EBITDA'),
                 })
                 
                 # Calculate real historical growth rates (CAGR over available years)
                 num_years = min(len(financials.columns), 5)  # Use up to 5 years
                 if num_years >= 2:
                     # Revenue Growth CAGR
-                    if 'Total Revenue' in financials.index:
-                        latest_revenue = financials.loc['Total Revenue', financials.columns[0]]
-                        oldest_revenue = financials.loc['Total Revenue', financials.columns[num_years - 1]]
-                        if oldest_revenue and oldest_revenue > 0 and latest_revenue and latest_revenue > 0:
-                            # CAGR = (End Value / Start Value)^(1/n) - 1
-                            revenue_cagr = ((latest_revenue / oldest_revenue) ** (1 / (num_years - 1)) - 1) * 100
-                            financial_data['revenue_growth'] = round(revenue_cagr, 2)
-                            financial_data['revenue_growth_years'] = num_years - 1
-                        else:
-                            financial_data['revenue_growth'] = 0
-                            financial_data['revenue_growth_years'] = 0
+                    if 'Total Revenue' in fin_idx:
+                        revenue_row = fin_values[fin_idx['Total Revenue'], :num_years]
+                        (financial_data['revenue_growth'],
+                         financial_data['revenue_growth_years']) = self._cagr(revenue_row)
                     
                     # Net Income (Profit) Growth CAGR
-                    if 'Net Income' in financials.index:
-                        latest_income = financials.loc['Net Income', financials.columns[0]]
-                        oldest_income = financials.loc['Net Income', financials.columns[num_years - 1]]
+                    if 'Net Income' in fin_idx:
+                        income_row = fin_values[fin_idx['Net Income'], :num_years]
                         
                         # Store history for consistency check (new)
-                        income_history = []
-                        for i in range(num_years):
-                            val = financials.loc['Net Income', financials.columns[i]]
-                            income_history.append(val)
-                        financial_data['net_income_history'] = income_history
+                        financial_data['net_income_history'] = list(income_row)
                         
-                        if oldest_income and oldest_income > 0 and latest_income and latest_income > 0:
-                            profit_cagr = ((latest_income / oldest_income) ** (1 / (num_years - 1)) - 1) * 100
-                            financial_data['earnings_growth'] = round(profit_cagr, 2)
-                            financial_data['earnings_growth_years'] = num_years - 1
-                        else:
-                            # Handle negative income scenarios
-                            financial_data['earnings_growth'] = 0
-                            financial_data['earnings_growth_years'] = 0
+                        # Negative income at either end yields no growth figure
+                        (financial_data['earnings_growth'],
+                         financial_data['earnings_growth_years']) = self._cagr(income_row)
                 else:
                     financial_data['revenue_growth'] = 8.0  # Default fallback
                     financial_data['earnings_growth'] = 10.0  # Default fallback
@@ -460,22 +664,30 @@ class DataFetcher:
             
             if not balance_sheet.empty:
                 # Balance sheet items (most recent year)
-                latest_col = balance_sheet.columns[0]
+                bs_idx, bs_values = self._row_index(balance_sheet)
+                
+                def bs_val(row):
+                    return bs_values[bs_idx[row], 0] if row in bs_idx else 0
+                
                 financial_data.update({
-                    'total_assets': balance_sheet.loc['Total Assets', latest_col] if 'Total Assets' in balance_sheet.index else 0,
-                    'total_debt': balance_sheet.loc['Total Debt', latest_col] if 'Total Debt' in balance_sheet.index else 0,
-                    'total_stockholder_equity': balance_sheet.loc['Stockholders Equity', latest_col] if 'Stockholders Equity' in balance_sheet.index else 0,
-                    'total_current_assets': balance_sheet.loc['Current Assets', latest_col] if 'Current Assets' in balance_sheet.index else 0,
-                    'total_current_liabilities': balance_sheet.loc['Current Liabilities', latest_col] if 'Current Liabilities' in balance_sheet.index else 0,
+                    'total_assets': bs_val('Total Assets'),
+                    'total_debt': bs_val('Total Debt'),
+                    'total_stockholder_equity': bs_val('Stockholders Equity'),
+                    'total_current_assets': bs_val('Current Assets'),
+                    'total_current_liabilities': bs_val('Current Liabilities'),
                 })
             
             if not cash_flow.empty:
                 # Cash flow items (most recent year)
-                latest_col = cash_flow.columns[0]
+                cf_idx, cf_values = self._row_index(cash_flow)
+                
+                def cf_val(row):
+                    return cf_values[cf_idx[row], 0] if row in cf_idx else 0
+                
                 financial_data.update({
-                    'operating_cash_flow': cash_flow.loc['Total Cash From Operating Activities', latest_col] if 'Total Cash From Operating Activities' in cash_flow.index else 0,
-                    'free_cash_flow': cash_flow.loc['Free Cash Flow', latest_col] if 'Free Cash Flow' in cash_flow.index else 0,
-                    'capital_expenditures': cash_flow.loc['Capital Expenditures', latest_col] if 'Capital Expenditures' in cash_flow.index else 0,
+                    'operating_cash_flow': cf_val('Total Cash From Operating Activities'),
+                    'free_cash_flow': cf_val('Free Cash Flow'),
+                    'capital_expenditures': cf_val('Capital Expenditures'),
                 })
             
             # Add raw dataframes for advanced analysis (Piotroski, Altman Z, etc.)
@@ -487,19 +699,22 @@ class DataFetcher:
             print(f"Error getting financial data: {str(e)}")
         
         # Fill missing values with defaults
-        defaults = {
-            'total_revenue': 0, 'operating_income': 0, 'net_income': 0, 'ebitda': 0,
-            'total_assets': 0, 'total_debt': 0, 'total_stockholder_equity': 0,
-            'total_current_assets': 0, 'total_current_liabilities': 0,
-            'operating_cash_flow': 0, 'free_cash_flow': 0, 'capital_expenditures': 0,
-            'revenue_growth': 8.0, 'earnings_growth': 10.0,
-            'revenue_growth_years': 0, 'earnings_growth_years': 0
-        }
-        for key, default_val in defaults.items():
-            if key not in financial_data:
-                financial_data[key] = default_val
-        
-        return financial_data
+        return {**_FINANCIAL_DEFAULTS, **financial_data}
+    
+    def _row_index(self, df: pd.DataFrame) -> Tuple[Dict[Any, int], np.ndarray]:
+        """Map row labels to positions and expose the statement as a raw 2-D array"""
+        return {name: i for i, name in enumerate(df.index)}, df.to_numpy()
+    
+    def _cagr(self, row: np.ndarray) -> Tuple[float, int]:
+        """CAGR (%) and span in years for a newest-first row; (0, 0) unless both ends are positive"""
+        row = np.asarray(row, dtype=np.float64)
+        latest, oldest = row[0], row[-1]
+        # NaN fails both comparisons, so missing endpoints fall through to (0, 0)
+        if not (latest > 0 and oldest > 0):
+            return 0, 0
+        # CAGR = (End Value / Start Value)^(1/n) - 1
+        years = len(row) - 1
+        return round((np.power(latest / oldest, 1.0 / years) - 1) * 100, 2), years
     
     def _calculate_change_percent(self, current: float, previous: float) -> float:
         """Calculate percentage change"""
@@ -526,48 +741,38 @@ class DataFetcher:
     
     
     def _search_yahoo_api(self, query: str) -> List[Dict[str, str]]:
-        """Search using Yahoo Finance API"""
-        url = f"https://query2.finance.yahoo.com/v1/finance/search?q={query}"
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        suggestions = []
-        
+        """Search using Yahoo Finance API (Delegates to cached function)"""
         try:
-            response = requests.get(url, headers=headers, timeout=5)
-            data = response.json()
-            
-            if 'quotes' in data:
-                for quote in data['quotes']:
-                    # Only include stocks and ETFs
-                    if quote.get('quoteType') in ['EQUITY', 'ETF', 'MUTUALFUND']:
-                        symbol = quote.get('symbol')
-                        shortname = quote.get('shortname') or quote.get('longname') or symbol
-                        exch = quote.get('exchange', '')
-                        
-                        # Add to suggestions
-                        suggestions.append({
-                            'name': shortname,
-                            'symbol': symbol,
-                            'score': 0.9 if query.lower() in shortname.lower() or query.lower() in symbol.lower() else 0.7,
-                            'exchange': exch
-                        })
+            return fetch_yahoo_search(query.lower().strip())
         except Exception as e:
             print(f"Yahoo API Search Error: {e}")
-            
-        return suggestions
+            return []
 
     def search_stocks(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
         """Search for stocks using Yahoo API and local fuzzy matching"""
         
-        # 1. Get API Suggestions
-        api_results = self._search_yahoo_api(query)
+        # 1. Get API Suggestions (in the background, overlapping the local scoring below).
+        # A dedicated thread carries this run's ScriptRunContext, which the cached search needs;
+        # pool threads are shared across sessions and have none.
+        api_result = {}
+        
+        def _fetch_api_suggestions():
+            api_result['data'] = self._search_yahoo_api(query)
+        
+        api_thread = threading.Thread(target=_fetch_api_suggestions, daemon=True)
+        add_script_run_ctx(api_thread, get_script_run_ctx())
+        api_thread.start()
         
         # 2. Get Local Fuzzy Suggestions
         local_suggestions = []
         normalized_query = self._normalize_query(query)
         
-        for name, symbol in self.common_indian_stocks.items():
-            # Calculate similarity ratio
-            similarity = SequenceMatcher(None, normalized_query, name).ratio()
+        # Calculate similarity ratios for all names at once (C++ Indel ratio, 0-100)
+        ratios = process.cdist([normalized_query], self._stock_names, scorer=fuzz.ratio, dtype=np.float64)[0]
+        
+        for name, ratio in zip(self._stock_names, ratios):
+            symbol = self.common_indian_stocks[name]
+            similarity = float(ratio) / 100
             
             # Boost score for exact substring matches
             if normalized_query in name:
@@ -587,6 +792,10 @@ class DataFetcher:
                     'exchange': 'NSE' if '.NS' in symbol else 'BSE'
                 })
         
+        # _search_yahoo_api handles its own errors; a timed-out request just contributes nothing
+        api_thread.join(timeout=5)
+        api_results = api_result.get('data', [])
+        
         # 3. Combine and Deduplicate
         # Create a dict by symbol to deduplicate, preferring higher score or API result
         combined = {}
@@ -595,30 +804,25 @@ class DataFetcher:
         for item in local_suggestions:
             combined[item['symbol']] = item
             
-        # Add/Update with API results (API usually more accurate for broad queries)
+        # Add/Update with API results, keeping whichever entry scores higher per symbol
         for item in api_results:
-            sym = item['symbol']
-            # If we have a local match for this symbol, average the scores or take max?
-            # Let's trust API existence but maybe keep our local human-readable name if we prefer it?
-            # For now, just overwrite or add
-            if sym in combined:
-                # If existing score is very high (exact match), keep it?
-                # Actually, simply taking the max score is good standard
-                 if item['score'] > combined[sym]['score']:
-                     combined[sym] = item
-            else:
-                combined[sym] = item
-        
-        # Convert back to list
-        final_list = list(combined.values())
-        
-        # Sort by score
-        final_list.sort(key=lambda x: x['score'], reverse=True)
-        
-        return final_list[:limit]
+            # Known symbols keep our readable name rather than Yahoo's abbreviated shortname
+            if item['symbol'] in self._symbol_to_name:
+                item = {**item, 'name': self._symbol_to_name[item['symbol']]}
+            existing = combined.setdefault(item['symbol'], item)
+            if item['score'] > existing['score']:
+                combined[item['symbol']] = item
+        
+        # Only the top `limit` are needed, so select them instead of sorting everything
+        return heapq.nlargest(limit, combined.values(), key=itemgetter('score'))
     
     def get_stock_with_suggestions(self, query: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, str]]]:
-        """Get stock data and also return similar stocks if not found"""
+        """Get stock data and also return similar stocks if not found (Delegates to cached function)"""
+        # Lookups are case/whitespace-insensitive, so normalize the key to share cache entries
+        return fetch_stock_with_suggestions(self, _WHITESPACE_RE.sub(' ', query.strip()).upper())
+    
+    def _lookup_stock_with_suggestions(self, query: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, str]]]:
+        """Uncached lookup behind get_stock_with_suggestions"""
         # Try to get the exact stock
         stock_data = self.get_stock_data(query)
         
@@ -637,19 +841,5 @@ class DataFetcher:
     
     def get_market_from_symbol(self, symbol: str) -> str:
         """Determine the market/country from stock symbol"""
-        if '.NS' in symbol or '.BO' in symbol:
-            return 'India'
-        elif '.L' in symbol:
-            return 'UK'
-        elif '.HK' in symbol:
-            return 'Hong Kong'
-        elif '.T' in symbol or '.JP' in symbol:
-            return 'Japan'
-        elif '.AX' in symbol:
-            return 'Australia'
-        elif '.SA' in symbol:
-            return 'Brazil'
-        elif '.TO' in symbol:
-            return 'Canada'
-        else:
-            return 'USA'
\ No newline at end of file
+        dot = symbol.rfind('.')
+        return _SUFFIX_TO_MARKET.get(symbol[dot:], 'USA') if dot >= 0 else 'USA'
\ No newline at end of file
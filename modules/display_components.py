@@ -1,14 +1,51 @@
 # modules/display_components.py
 import streamlit as st
-import plotly.graph_objects as go
-import pandas as pd
+import functools
+import math
+from bisect import bisect_right
+import numpy as np
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from numpy.lib.stride_tricks import sliding_window_view
 from utils import format_currency, get_status_emoji
 
-def display_stock_info(stock_data: dict):
-    """Beautiful stock header with live indicator"""
-    market = st.session_state.data_fetcher.get_market_from_symbol(stock_data.get('symbol', ''))
+if TYPE_CHECKING:
+    import pandas as pd
+    import plotly.graph_objects as go
+
+@dataclass(slots=True, frozen=True)
+class DisplayCtx:
+    """Symbol, market and currency for the stock on screen, resolved once per results page"""
+    symbol: str
+    market: str
+    currency_code: str
+    currency_symbol: str
+
+def build_display_ctx(stock_data: dict) -> DisplayCtx:
+    """Build the display context, reusing the market/currency the fetcher already resolved"""
+    symbol = stock_data.get('symbol', 'N/A')
     currency_code = stock_data.get('currency', 'INR')
-    currency_symbol = st.session_state.data_fetcher.get_currency_symbol(currency_code, market)
+    market = stock_data.get('market') or st.session_state.data_fetcher.get_market_from_symbol(symbol)
+    currency_symbol = (stock_data.get('currency_symbol')
+                       or st.session_state.data_fetcher.get_currency_symbol(currency_code, market))
+    return DisplayCtx(symbol, market, currency_code, currency_symbol)
+
+def display_stock_info(stock_data: dict, ctx: DisplayCtx):
+    """Beautiful stock header with live indicator"""
+    # Read every field once up front
+    get = stock_data.get
+    price = get('current_price', 0)
+    change = get('change_percent', 0)
+    market_cap = get('market_cap', 0)
+    pe = get('pe_ratio')
+    high_52w = get('fifty_two_week_high', 0)
+    long_name = get('long_name', 'N/A')
+    exchange = get('exchange', 'N/A')
+    sector = get('sector', 'N/A')
+    industry = get('industry', 'N/A')
+    ph = get('promoter_holding', 0)
+    summary = get('business_summary')
+    symbol, currency_code, currency_symbol = ctx.symbol, ctx.currency_code, ctx.currency_symbol
 
     st.markdown("""
     <div class="stock-info-card card-3d">
@@ -21,52 +58,60 @@ def display_stock_info(stock_data: dict):
 
     st.markdown("### Stock Overview")
     col1, col2, col3, col4 = st.columns(4)
-    change = stock_data.get('change_percent', 0)
     price_class = "price-up" if change >= 0 else "price-down"
 
     with col1:
         st.metric("Current Price",
-                  format_currency(stock_data.get('current_price', 0), currency=currency_symbol),
+                  format_currency(price, currency=currency_symbol),
                   delta=f"{change:+.2f}%")
     with col2:
         st.metric("Market Cap",
-                  format_currency(stock_data.get('market_cap', 0), currency=currency_symbol, is_large=True))
+                  format_currency(market_cap, currency=currency_symbol, is_large=True))
     with col3:
-        st.metric("P/E Ratio", f"{stock_data.get('pe_ratio', 0):.2f}" if stock_data.get('pe_ratio') else "N/A")
+        st.metric("P/E Ratio", f"{pe:.2f}" if pe else "N/A")
     with col4:
-        st.metric("52W High", format_currency(stock_data.get('fifty_two_week_high', 0), currency=currency_symbol))
+        st.metric("52W High", format_currency(high_52w, currency=currency_symbol))
 
     with st.expander("Detailed Company Information"):
         col1, col2 = st.columns(2)
         with col1:
-            st.write(f"**Company:** {stock_data.get('long_name', 'N/A')}")
-            st.write(f"**Symbol:** {stock_data.get('symbol', 'N/A')}")
-            st.write(f"**Exchange:** {stock_data.get('exchange', 'N/A')}")
+            st.write(f"**Company:** {long_name}")
+            st.write(f"**Symbol:** {symbol}")
+            st.write(f"**Exchange:** {exchange}")
         with col2:
-            st.write(f"**Sector:** {stock_data.get('sector', 'N/A')}")
-            st.write(f"**Industry:** {stock_data.get('industry', 'N/A')}")
+            st.write(f"**Sector:** {sector}")
+            st.write(f"**Industry:** {industry}")
             st.write(f"**Currency:** {currency_code} ({currency_symbol})")
             
             # Show Promoter Holding
-            ph = stock_data.get('promoter_holding', 0)
             if ph > 0:
                 st.write(f"**Promoter Holding:** {ph:.2f}%")
             else:
                 st.write("**Promoter Holding:** N/A")
-        if stock_data.get('business_summary'):
+        if summary:
             st.markdown("**Business Summary (AI Analysis):**")
             # Use the new typewriter effect
-            typewriter_text(stock_data['business_summary'], speed=10)
+            typewriter_text(summary, speed=10)
+
+# Score bands: bisect_right(thresholds, value) indexes the matching entry (lower bounds inclusive)
+BUFFETT_GRADE_THRESHOLDS = (40, 60, 75)
+BUFFETT_GRADES = ("Poor", "Average", "Good", "Excellent")
+BUFFETT_GRADE_EMOJI = ("🔴", "🟡", "🔵", "🟢")
+TECH_SCORE_THRESHOLDS = (40, 60, 80)
+TECH_SCORE_COLORS = ('#dc3545', '#ffc107', '#17a2b8', '#28a745')
+
+# Indexed by passed: False -> (color, icon) for a failed check, True -> for a passed one
+SMART_ROW_STATUS = (("var(--error)", "❌"), ("var(--neon-green)", "✅"))
 
 def display_buffett_analysis(analysis_result: dict):
     """15-Point Buffett Score"""
-    st.markdown("<div class='section-divider'></div>", unsafe_allow_html=True)
-    st.markdown("<div class='card-3d'><h3>⚡ Buffett's 15-Point Analysis</h3></div>", unsafe_allow_html=True)
+    st.markdown("<div class='section-divider'></div><div class='card-3d'><h3>⚡ Buffett's 15-Point Analysis</h3></div>", unsafe_allow_html=True)
 
     score = analysis_result['total_score']
     percent = (score / 15) * 100
-    grade = "Excellent" if percent >= 75 else "Good" if percent >= 60 else "Average" if percent >= 40 else "Poor"
-    color = "🟢" if percent >= 75 else "🔵" if percent >= 60 else "🟡" if percent >= 40 else "🔴"
+    band = bisect_right(BUFFETT_GRADE_THRESHOLDS, percent)
+    grade = BUFFETT_GRADES[band]
+    color = BUFFETT_GRADE_EMOJI[band]
 
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -76,75 +121,34 @@ def display_buffett_analysis(analysis_result: dict):
         st.markdown(f"<div class='score-badge score-{grade.lower()}'>{color} {grade}</div>", unsafe_allow_html=True)
     # col3 removed as requested
 
-    # Smart List UI
-    st.markdown("<div style='margin-top: 20px;'>", unsafe_allow_html=True)
+    # Smart List UI (all rows in one markdown element)
+    # Rows are left-aligned: indented HTML after the first row would be parsed as a code block
+    parts = []
     for m in analysis_result['metrics']:
-        icon = "✅" if m['passed'] else "❌"
-        status_color = "var(--neon-green)" if m['passed'] else "var(--error)"
-        glow = f"box-shadow: 0 0 10px {status_color};" if m['passed'] else ""
-        
-        # Format the HTML row
-        html = f"""
-        <div class="smart-row" style="border-right: 3px solid {status_color}">
-            <div class="smart-label">
-                {m['name']}
-                <span class="smart-sub">Criteria: {m['criteria']}</span>
-            </div>
-            <div style="display:flex; align-items:center;">
-                <span class="smart-value">{m['value']}</span>
-                <span class="smart-icon" style="color: {status_color};">{icon}</span>
-            </div>
-        </div>
-        """
-        st.markdown(html, unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-
-    # DataFrame removed in favor of Smart UI
-    # df = pd.DataFrame(metrics)
-    # st.dataframe(df, use_container_width=True, hide_index=True)
+        status_color, icon = SMART_ROW_STATUS[bool(m['passed'])]
+        parts.append(f"""<div class="smart-row" style="border-right: 3px solid {status_color}">
+<div class="smart-label">
+{m['name']}
+<span class="smart-sub">Criteria: {m['criteria']}</span>
+</div>
+<div style="display:flex; align-items:center;">
+<span class="smart-value">{m['value']}</span>
+<span class="smart-icon" style="color: {status_color};">{icon}</span>
+</div>
+</div>""")
+    st.markdown("<div style='margin-top: 20px;'>" + "".join(parts) + "</div>", unsafe_allow_html=True)
 
     # Pie chart removed as requested
 
-def display_buy_recommendation(analysis_result: dict):
-    """Big beautiful recommendation card"""
-    st.markdown("<div class='section-divider'></div>", unsafe_allow_html=True)
-    rec = analysis_result['recommendation']
-    status = rec['status']
-    mos = rec.get('margin_of_safety', 0)
-
-    if status == "Buy":
-        card_class = "rec-buy"
-        icon = "Strong Buy"
-        text = "EXCELLENT BUYING OPPORTUNITY"
-    elif status == "Hold":
-        card_class = "rec-hold"
-        icon = "Hold"
-        text = "WAIT FOR BETTER PRICE"
-    else:
-        card_class = "rec-avoid"
-        icon = "Avoid"
-        text = "OVERVALUED – STAY AWAY"
-
-    currency_symbol = rec.get('currency_symbol', '₹')
-
-    st.markdown(f"<div class='card-3d {card_class}'><h2>{icon} {text}</h2>", unsafe_allow_html=True)
-
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("Current Price", format_currency(rec['current_price'], currency=currency_symbol))
-    with col2:
-        st.metric("Intrinsic Value", format_currency(rec['intrinsic_value'], currency=currency_symbol))
-    with col3:
-        st.metric("Margin of Safety", f"{mos:.1f}%", delta="Good" if mos > 20 else "Low")
-
-    if status == "Buy":
-        st.success(f"Buy Range: {format_currency(rec['buy_price_min'], currency=currency_symbol)} – {format_currency(rec['buy_price_max'], currency=currency_symbol)}")
-    elif status == "Hold":
-        st.info(f"Wait to buy below: {format_currency(rec.get('target_price', 0), currency=currency_symbol)}")
+REC_CARD_TPL = """<div class='section-divider'></div><div class='card-3d {card_class}'><h2>{icon} {text}</h2>
+<div class="rec-metrics">
+<div class="rec-metric"><div class="rec-metric-label">Current Price</div><div class="rec-metric-value">{price}</div></div>
+<div class="rec-metric"><div class="rec-metric-label">Intrinsic Value</div><div class="rec-metric-value">{intrinsic}</div></div>
+<div class="rec-metric"><div class="rec-metric-label">Margin of Safety</div><div class="rec-metric-value">{mos:.1f}%</div><div class="rec-metric-delta">↑ {mos_note}</div></div>
+</div>
+</div>"""
 
-    # Methodology Explanation
-    with st.expander("ℹ️ Methodology: How we calculate this?", expanded=False):
-        st.markdown("""
+METHODOLOGY_MD = """
         ### 📊 Valuation Methodology: Graham & Buffett Style
         
         Our **Intrinsic Value** is calculated using a conservative **Discounted Cash Flow (DCF)** model, inspired by **Warren Buffett** and **Benjamin Graham's** principles of value investing.
@@ -182,9 +186,81 @@ def display_buy_recommendation(analysis_result: dict):
         </div>
 
         *Note: This is a quantitative model and does not account for qualitative factors like management integrity or brand moat (though our 15-point checklist tries to capture some of this).*
-        """, unsafe_allow_html=True)
+        """
+
+def display_buy_recommendation(analysis_result: dict, ctx: DisplayCtx):
+    """Big beautiful recommendation card"""
+    rec = analysis_result['recommendation']
+    status = rec['status']
+    mos = rec.get('margin_of_safety', 0)
+
+    if status == "Buy":
+        card_class = "rec-buy"
+        icon = "Strong Buy"
+        text = "EXCELLENT BUYING OPPORTUNITY"
+    elif status == "Hold":
+        card_class = "rec-hold"
+        icon = "Hold"
+        text = "WAIT FOR BETTER PRICE"
+    else:
+        card_class = "rec-avoid"
+        icon = "Avoid"
+        text = "OVERVALUED – STAY AWAY"
+
+    currency_symbol = ctx.currency_symbol
+
+    # Divider, card header and the three headline figures in one element; the alert and
+    # expander below are Streamlit widgets, so the card is closed before them
+    st.markdown(REC_CARD_TPL.format(
+        card_class=card_class, icon=icon, text=text,
+        price=format_currency(rec['current_price'], currency=currency_symbol),
+        intrinsic=format_currency(rec['intrinsic_value'], currency=currency_symbol),
+        mos=mos, mos_note="Good" if mos > 20 else "Low",
+    ), unsafe_allow_html=True)
+
+    if status == "Buy":
+        st.success(f"Buy Range: {format_currency(rec['buy_price_min'], currency=currency_symbol)} – {format_currency(rec['buy_price_max'], currency=currency_symbol)}")
+    elif status == "Hold":
+        st.info(f"Wait to buy below: {format_currency(rec.get('target_price', 0), currency=currency_symbol)}")
 
-    st.markdown("</div>", unsafe_allow_html=True)
+    # Methodology Explanation
+    with st.expander("ℹ️ Methodology: How we calculate this?", expanded=False):
+        st.markdown(METHODOLOGY_MD, unsafe_allow_html=True)
+
+# Gauge bands as (start, end, color); same palette as the verdict colors, at 40% opacity
+GAUGE_BANDS = (
+    (0, 40, 'rgba(220, 53, 69, 0.4)'),  # Red
+    (40, 60, 'rgba(255, 193, 7, 0.4)'), # Yellow
+    (60, 80, 'rgba(23, 162, 184, 0.4)'), # Cyan/Blue
+    (80, 100, 'rgba(40, 167, 69, 0.4)') # Green
+)
+GAUGE_CX, GAUGE_CY, GAUGE_R = 100, 120, 80
+
+def _gauge_point(value, radius=GAUGE_R):
+    """SVG coordinates of a 0-100 value on the gauge's upper semicircle (0 = left, 100 = right)"""
+    theta = math.pi * (1 - min(max(value, 0), 100) / 100)
+    return GAUGE_CX + radius * math.cos(theta), GAUGE_CY - radius * math.sin(theta)
+
+def _gauge_arc(start, end, color, width):
+    (x0, y0), (x1, y1) = _gauge_point(start), _gauge_point(end)
+    return (f'<path d="M{x0:.2f},{y0:.2f} A{GAUGE_R},{GAUGE_R} 0 0 1 {x1:.2f},{y1:.2f}" '
+            f'fill="none" stroke="{color}" stroke-width="{width}"/>')
+
+@functools.lru_cache(maxsize=128)
+def _gauge_svg(score) -> str:
+    """Technical score gauge as inline SVG; depends only on the score, so each value is built once"""
+    bands = ''.join(_gauge_arc(start, end, color, 24) for start, end, color in GAUGE_BANDS)
+    bar = _gauge_arc(0, score, '#2E2E2E', 10) if score > 0 else ''
+    (tx0, ty0), (tx1, ty1) = _gauge_point(score, GAUGE_R - 9), _gauge_point(score, GAUGE_R + 9)
+    threshold = f'<line x1="{tx0:.2f}" y1="{ty0:.2f}" x2="{tx1:.2f}" y2="{ty1:.2f}" stroke="#fff" stroke-width="4"/>'
+    return (
+        '<div style="height: 250px; display: flex; justify-content: center;">'
+        '<svg viewBox="0 0 200 135" style="height: 100%; max-width: 100%;" role="img" aria-label="Technical Score">'
+        '<text x="100" y="16" text-anchor="middle" font-size="14" fill="#8b9bb4">Technical Score</text>'
+        f'{bands}{bar}{threshold}'
+        f'<text x="100" y="118" text-anchor="middle" font-size="30" fill="white">{score:g}</text>'
+        '</svg></div>'
+    )
 
 def display_technical_analysis(stock_data: dict):
     """Technical indicators Dashboard with Score"""
@@ -193,45 +269,25 @@ def display_technical_analysis(stock_data: dict):
     st.markdown("### ⚡ Technical Analysis Dashboard")
     
     tech = st.session_state.analyzer.get_technical_indicators(stock_data)
-    currency_symbol = stock_data.get('currency_symbol', '₹')
+    get = tech.get
     
-    score = tech.get('technical_score', 50)
-    verdict = tech.get('verdict', 'Neutral')
-    action = tech.get('action', 'HOLD')
+    score = get('technical_score', 50)
+    verdict = get('verdict', 'Neutral')
+    action = get('action', 'HOLD')
+    rsi, stoch_k, macd = get('rsi', 0), get('stoch_k', 0), get('macd', 0)
+    ema_9, ema_21 = get('ema_9', 0), get('ema_21', 0)
+    verdict_color = TECH_SCORE_COLORS[bisect_right(TECH_SCORE_THRESHOLDS, score)]
     
     # 1. Score Gauge & Verdict
     col1, col2 = st.columns([1, 2])
     
     with col1:
-            # Create Gauge Chart
-        fig = go.Figure(go.Indicator(
-            mode = "gauge+number",
-            value = score,
-            domain = {'x': [0, 1], 'y': [0, 1]},
-            title = {'text': "Technical Score", 'font': {'size': 24, 'color': '#8b9bb4'}},
-            gauge = {
-                'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "#8b9bb4"},
-                'bar': {'color': "#2E2E2E"}, # Hide default bar, rely on steps or threshold
-                'steps': [
-                    {'range': [0, 40], 'color': 'rgba(220, 53, 69, 0.4)'},  # Red
-                    {'range': [40, 60], 'color': 'rgba(255, 193, 7, 0.4)'}, # Yellow
-                    {'range': [60, 80], 'color': 'rgba(23, 162, 184, 0.4)'}, # Cyan/Blue
-                    {'range': [80, 100], 'color': 'rgba(40, 167, 69, 0.4)'} # Green
-                ],
-                'threshold': {
-                    'line': {'color': "#fff", 'width': 4},
-                    'thickness': 0.75,
-                    'value': score
-                }
-            }
-        ))
-        fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", font={'color': "white"}, height=250, margin=dict(l=20,r=20,t=40,b=20))
-        st.plotly_chart(fig, use_container_width=True)
+        st.markdown(_gauge_svg(score), unsafe_allow_html=True)
         
     with col2:
         st.markdown(f"""
-        <div style="background: rgba(255,255,255,0.05); padding: 20px; border-radius: 10px; border-left: 5px solid {'#28a745' if score >= 80 else '#17a2b8' if score >= 60 else '#ffc107' if score >= 40 else '#dc3545'};">
-            <h3 style="margin-top:0;">Verdict: <span style="color: {'#28a745' if score >= 80 else '#17a2b8' if score >= 60 else '#ffc107' if score >= 40 else '#dc3545'};">{verdict}</span></h3>
+        <div style="background: rgba(255,255,255,0.05); padding: 20px; border-radius: 10px; border-left: 5px solid {verdict_color};">
+            <h3 style="margin-top:0;">Verdict: <span style="color: {verdict_color};">{verdict}</span></h3>
             <p style="color: #8b9bb4; font-size: 1.1rem; margin-top: 10px;">Based on Momentum (RSI, Stoch), Trend (SMA, EMA), and Volatility (BB).</p>
         </div>
         """, unsafe_allow_html=True)
@@ -242,36 +298,56 @@ def display_technical_analysis(stock_data: dict):
     kpi1, kpi2, kpi3, kpi4, kpi5 = st.columns(5)
     
     with kpi1:
-        st.metric("RSI (14)", f"{tech.get('rsi', 0):.1f}")
+        st.metric("RSI (14)", f"{rsi:.1f}")
     with kpi2:
-        st.metric("Stochastic", f"{tech.get('stoch_k', 0):.1f}")
+        st.metric("Stochastic", f"{stoch_k:.1f}")
     with kpi3:
-        st.metric("MACD", f"{tech.get('macd', 0):.2f}")
+        st.metric("MACD", f"{macd:.2f}")
     with kpi4:
-        st.metric("Fast EMA (9)", f"{tech.get('ema_9', 0):.2f}")
+        st.metric("Fast EMA (9)", f"{ema_9:.2f}")
     with kpi5:
-        st.metric("Slow EMA (21)", f"{tech.get('ema_21', 0):.2f}")
+        st.metric("Slow EMA (21)", f"{ema_21:.2f}")
+
+# A 1Y daily history (~252 bars) is plotted as-is; longer/intraday series are thinned to this
+CHART_MAX_POINTS = 600
+
+@st.cache_data(show_spinner=False)
+def _sma(close: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average, cached on the close array so reruns skip the rolling pass"""
+    sma = np.full(len(close), np.nan)
+    if len(close) >= window:
+        # Mean over each full window; a NaN inside a window yields NaN, as with rolling().mean()
+        sma[window - 1:] = sliding_window_view(close, window).mean(axis=1)
+    return sma
+
+def _downsample_positions(n: int, max_points: int = CHART_MAX_POINTS) -> np.ndarray:
+    """Evenly strided positions (always including the latest point) so at most ~max_points are plotted"""
+    if n <= max_points:
+        return np.arange(n)
+    keep = np.arange(0, n, -(-n // max_points))
+    return keep if keep[-1] == n - 1 else np.append(keep, n - 1)
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _build_neon_chart(close: "pd.Series") -> "go.Figure":
+    """1Y close chart with 50 SMA; cached on the close series so reruns reuse the built figure"""
+    # Imported on first chart build so pages that never draw it skip loading Plotly
+    import plotly.graph_objects as go
+
+    # Thin long histories before they are serialized; the SMA is computed on the full series first
+    keep = _downsample_positions(len(close))
+    x = close.index[keep]
+    prices = close.to_numpy()
+
+    # Plot y-values as float32: plenty for display and half the serialized array size
+    # (timestamps on x keep full precision)
 
-def display_neon_chart(stock_data: dict):
-    """
-    3D Neon Glow Chart using Plotly
-    """
-    if 'history' not in stock_data or stock_data['history'] is None or stock_data['history'].empty:
-        st.warning("No historical data available for chart.")
-        return
-
-    st.markdown("<div class='section-divider'></div>", unsafe_allow_html=True)
-    st.markdown("<div class='card-3d'><h3>⚡ Market Performance (1Y)</h3>", unsafe_allow_html=True)
-    
-    df = stock_data['history']
-    
     # Create figure
     fig = go.Figure()
 
     # Add Glowing Area Chart
     fig.add_trace(go.Scatter(
-        x=df.index, 
-        y=df['Close'],
+        x=x, 
+        y=prices[keep].astype(np.float32),
         mode='lines',
         name='Close Price',
         line=dict(color='#00f3ff', width=3),  # Neon Blue Line
@@ -280,9 +356,9 @@ def display_neon_chart(stock_data: dict):
     ))
 
     # Add Moving Averages for "Technical" feel
-    if len(df) > 50:
+    if len(close) > 50:
         fig.add_trace(go.Scatter(
-            x=df.index, y=df['Close'].rolling(window=50).mean(),
+            x=x, y=_sma(prices, 50)[keep].astype(np.float32),
             mode='lines', name='50 SMA',
             line=dict(color='#ffd700', width=1, dash='dot') # Neon Gold
         ))
@@ -308,17 +384,34 @@ def display_neon_chart(stock_data: dict):
     
     # Custom "Glow" effect via Marker Line (hacky but visually effective in JS, here we rely on line color)
     
-    st.plotly_chart(fig, use_container_width=True)
-    st.markdown("</div>", unsafe_allow_html=True)
+    return fig
+
+def display_neon_chart(stock_data: dict):
+    """
+    3D Neon Glow Chart using Plotly
+    """
+    if 'history' not in stock_data or stock_data['history'] is None or stock_data['history'].empty:
+        st.warning("No historical data available for chart.")
+        return
+
+    st.markdown("<div class='section-divider'></div><div class='card-3d'><h3>⚡ Market Performance (1Y)</h3></div>", unsafe_allow_html=True)
+    
+    # _build_neon_chart is cached on the series, so an unchanged history reuses its figure
+    st.plotly_chart(_build_neon_chart(stock_data['history']['Close']), use_container_width=True)
 
 def typewriter_text(text: str, speed: int = 20):
     """
     Displays text in a styled 'Cyberpunk Terminal' card using native Streamlit markdown.
     This avoids iframe layout issues and ensures full responsiveness.
     """
+    st.markdown(_terminal_html(text), unsafe_allow_html=True)
+
+@functools.lru_cache(maxsize=64)
+def _terminal_html(text: str) -> str:
+    """Terminal card markup for a summary; summaries are stable per symbol, so build each once"""
     safe_text = text.replace("\n", " ").strip()
     
-    st.markdown(f"""
+    return f"""
     <div class="terminal-card">
         <div class="terminal-header">
             <span class="terminal-dot red"></span>
@@ -330,60 +423,40 @@ def typewriter_text(text: str, speed: int = 20):
             <p>{safe_text}<span class="cursor">_</span></p>
         </div>
     </div>
-    """, unsafe_allow_html=True)
-
-def display_advanced_metrics(analysis_result):
-    """
-    Displays the Piotroski F-Score, Graham Number, and Altman Z-Score
-    in a styled "Pro Fundamentals" card.
     """
-    adv = analysis_result.get('advanced_metrics', {})
-    if not adv:
-        return
 
-    piotroski = adv.get('piotroski', {'score': 0})
-    altman = adv.get('altman_z', {'score': 0}) # Explicitly defined
-
-    # Logic for styling
-    p_score = piotroski.get('score', 0)
-    if p_score >= 7:
-        p_color = "var(--neon-green)"
-        p_label = "Strong"
-    elif p_score >= 4:
-        p_color = "var(--neon-gold)" 
-        p_label = "Average"
-    else:
-        p_color = "var(--error)"
-        p_label = "Weak"
-        
-    roic = adv.get('roic', 0)
-    if roic > 15:
-        r_color = "var(--neon-green)"
-        r_label = "Excellent"
-    elif roic > 10:
-        r_color = "var(--neon-green)" # Still good
-        r_label = "Good"
-    elif roic > 0:
-        r_color = "var(--neon-gold)"
-        r_label = "Average"
-    else:
-        r_color = "var(--error)"
-        r_label = "Poor"
-    
-    z_score = altman.get('score', 0)
-    z_zone = altman.get('zone', 'Unknown')
-    if z_score > 2.99:
-        z_color = "var(--neon-green)"
-        z_label = "Safe Zone"
-    elif z_score > 1.8:
-        z_color = "var(--neon-gold)"
-        z_label = "Grey Zone"
-    else:
-        z_color = "var(--error)"
-        z_label = "Distress Zone"
-    
-    st.markdown(f"""
-<div class="card-3d" style="border-top: 3px solid var(--neon-purple);">
+# Score bands as (threshold, color, label), best first; the last row catches everything below
+PIOTROSKI_BANDS = (
+    (7, "var(--neon-green)", "Strong"),
+    (4, "var(--neon-gold)", "Average"),
+    (float('-inf'), "var(--error)", "Weak"),
+)
+ROIC_BANDS = (
+    (15, "var(--neon-green)", "Excellent"),
+    (10, "var(--neon-green)", "Good"), # Still good
+    (0, "var(--neon-gold)", "Average"),
+    (float('-inf'), "var(--error)", "Poor"),
+)
+ALTMAN_Z_BANDS = (
+    (2.99, "var(--neon-green)", "Safe Zone"),
+    (1.8, "var(--neon-gold)", "Grey Zone"),
+    (float('-inf'), "var(--error)", "Distress Zone"),
+)
+
+def _band(value, bands, inclusive=False):
+    """(color, label) of the first band the value clears (>= if inclusive, else >)"""
+    for threshold, color, label in bands:
+        if value >= threshold if inclusive else value > threshold:
+            return color, label
+    return bands[-1][1:]
+
+# Detail row per criterion, indexed by passed: False -> failed, True -> passed
+PIOTROSKI_DETAIL_ROW = (
+    '<div style="font-size: 0.85em; color: var(--error);">✘ {}</div>',
+    '<div style="font-size: 0.85em; color: var(--neon-green);">✔ {}</div>',
+)
+
+ADVANCED_METRICS_TPL = """<div class="card-3d" style="border-top: 3px solid var(--neon-purple);">
 <h3 style="color: var(--neon-purple); margin-bottom: 20px; display: flex; align-items: center; gap: 10px;">
 💎 Pro Fundamentals <span style="font-size: 0.7em; opacity: 0.7; border: 1px solid var(--neon-purple); border-radius: 4px; padding: 2px 6px;">INSTITUTIONAL GRADE</span>
 </h3>
@@ -406,7 +479,7 @@ def display_advanced_metrics(analysis_result):
 <div style="background: rgba(255,255,255,0.03); padding: 15px; border-radius: 10px; border-left: 3px solid {r_color};">
 <div style="color: var(--text-dim); font-size: 0.9em;">ROIC (Return on Capital)</div>
 <div style="font-size: 1.8em; font-weight: bold; color: {r_color}; font-family: var(--font-mono); margin: 5px 0;">
-{f"{roic:.2f}%"} <span style="font-size: 0.5em; text-transform: uppercase;">{r_label}</span>
+{roic:.2f}% <span style="font-size: 0.5em; text-transform: uppercase;">{r_label}</span>
 </div>
 <div style="font-size: 0.75em; color: var(--text-dim); margin-top: 8px; border-top: 1px solid rgba(255,255,255,0.1); padding-top: 5px;">
 <span style="background: rgba(0,0,0,0.3); padding: 2px 5px; border-radius: 4px; font-family: monospace; color: var(--neon-blue);">Criteria: &gt;10% Good, &gt;15% Great</span>
@@ -430,9 +503,38 @@ def display_advanced_metrics(analysis_result):
 <details>
 <summary style="cursor: pointer; color: var(--text-dim); font-size: 0.9em;">View Piotroski Details</summary>
 <div style="margin-top: 10px; display: grid; grid-template-columns: 1fr 1fr; gap: 10px;">
-{''.join([f'<div style="font-size: 0.85em; color: {"var(--neon-green)" if v else "var(--error)"};">{"✔" if v else "✘"} {k}</div>' for k, v in piotroski.get('details', {}).items()])}
+{details}
 </div>
 </details>
 </div>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+"""
+
+def display_advanced_metrics(analysis_result):
+    """
+    Displays the Piotroski F-Score, Graham Number, and Altman Z-Score
+    in a styled "Pro Fundamentals" card.
+    """
+    adv = analysis_result.get('advanced_metrics', {})
+    if not adv:
+        return
+
+    piotroski = adv.get('piotroski', {'score': 0})
+    altman = adv.get('altman_z', {'score': 0}) # Explicitly defined
+
+    # Logic for styling
+    p_score = piotroski.get('score', 0)
+    roic = adv.get('roic', 0)
+    z_score = altman.get('score', 0)
+    p_color, p_label = _band(p_score, PIOTROSKI_BANDS, inclusive=True)
+    r_color, r_label = _band(roic, ROIC_BANDS)
+    z_color, z_label = _band(z_score, ALTMAN_Z_BANDS)
+
+    details = ''.join(PIOTROSKI_DETAIL_ROW[bool(v)].format(k) for k, v in piotroski.get('details', {}).items())
+
+    st.markdown(ADVANCED_METRICS_TPL.format_map({
+        'p_color': p_color, 'p_score': p_score, 'p_label': p_label,
+        'r_color': r_color, 'roic': roic, 'r_label': r_label,
+        'z_color': z_color, 'z_score': z_score, 'z_label': z_label,
+        'details': details,
+    }), unsafe_allow_html=True)
\ No newline at end of file
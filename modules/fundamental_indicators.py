@@ -1,6 +1,45 @@
 import pandas as pd
 import numpy as np
 
+# Statement rows read by the Piotroski F-Score, per statement
+PIOTROSKI_FIN_ROWS = ['Net Income', 'Total Revenue', 'Gross Profit']
+PIOTROSKI_BS_ROWS = ['Total Assets', 'Long Term Debt', 'Current Assets', 'Current Liabilities',
+                     'Ordinary Shares Number', 'Common Stock']
+PIOTROSKI_CF_ROWS = ['Total Cash From Operating Activities']
+
+# Statement rows read by the Altman Z-Score, per statement
+ALTMAN_FIN_ROWS = ['EBIT', 'Pretax Income', 'Interest Expense', 'Total Revenue']
+ALTMAN_BS_ROWS = ['Total Assets', 'Current Assets', 'Current Liabilities', 'Retained Earnings',
+                  'Total Liabilities Net Minority Interest', 'Total Liabilities']
+
+# Piotroski criteria labels, in scoring order
+PIOTROSKI_CRITERIA = (
+    'Positive ROA',
+    'Positive OCF',
+    'ROA Increasing',
+    'Quality of Earnings (OCF > NI)',
+    'Lower Leverage',
+    'Higher Liquidity (Current Ratio)',
+    'No Dilution',
+    'Higher Gross Margin',
+    'Higher Asset Turnover',
+)
+
+def _statement_rows(df: pd.DataFrame, rows: list, cols: list, fill: float = 0.0) -> np.ndarray:
+    """Rows x cols of a statement as floats in one copy; missing rows/columns and NaN become `fill`"""
+    return df.reindex(index=rows, columns=cols).to_numpy(dtype=float, na_value=fill)
+
+def _latest_two(cols: pd.Index) -> tuple:
+    """Newest and second-newest statement columns, whatever order yfinance returned them in"""
+    idx = np.argsort(pd.to_datetime(cols).to_numpy())[::-1][:2]
+    return cols[idx[0]], cols[idx[1]]
+
+def _safe_div(num, den) -> np.ndarray:
+    """Element-wise num / den, with 0 wherever the denominator is 0"""
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    return np.divide(num, den, out=np.zeros(np.broadcast(num, den).shape), where=den != 0)
+
 class FundamentalIndicators:
     """
     Calculates advanced fundamental metrics:
@@ -21,135 +60,55 @@ class FundamentalIndicators:
             if financials.empty or balance_sheet.empty or cash_flow.empty:
                 return {'score': 0, 'details': {}}
 
-            # Get latest two years columns, explicitly SORTED by date descending (Newest First)
-            cols = sorted(financials.columns, reverse=True)
-            if len(cols) < 2:
+            # Latest two years columns by date (Newest First)
+            if len(financials.columns) < 2:
                 return {'score': 0, 'details': {}}
             
-            t = cols[0]   # Current Year
-            t_1 = cols[1] # Previous Year
-            
-            # Helper for safe extraction
-            def get_val(df, row, col):
-                if row in df.index:
-                    val = df.loc[row, col]
-                    return 0 if pd.isna(val) else val
-                return 0
-            
-            # --- PROFITABILITY (4 points) ---
-            
-            # 1. ROA > 0
-            net_income = get_val(financials, 'Net Income', t)
-            total_assets = get_val(balance_sheet, 'Total Assets', t) or 1 # Avoid div by zero
-            total_assets_prev = get_val(balance_sheet, 'Total Assets', t_1) or total_assets
-            avg_assets = (total_assets + total_assets_prev) / 2
-            roa = net_income / avg_assets if avg_assets else 0
-            
-            if roa > 0:
-                score += 1
-                details['Positive ROA'] = True
-            else:
-                details['Positive ROA'] = False
-                
-            # 2. Operating Cash Flow > 0
-            # 2. Operating Cash Flow > 0
-            ocf = get_val(cash_flow, 'Total Cash From Operating Activities', t)
-            if ocf > 0:
-                score += 1
-                details['Positive OCF'] = True
-            else:
-                details['Positive OCF'] = False
-                
-            # 3. ROA Increasing (Current ROA > Prev ROA)
-            # 3. ROA Increasing (Current ROA > Prev ROA)
-            net_income_prev = get_val(financials, 'Net Income', t_1)
-            # total_assets_prev already fetched above
-            roa_prev = net_income_prev / total_assets_prev if total_assets_prev else 0
-            
-            if roa > roa_prev:
-                score += 1
-                details['ROA Increasing'] = True
-            else:
-                details['ROA Increasing'] = False
-                
-            # 4. Accruals (OCF > Net Income)
-            if ocf > net_income:
-                score += 1
-                details['Quality of Earnings (OCF > NI)'] = True
-            else:
-                details['Quality of Earnings (OCF > NI)'] = False
-                
-            # --- LEVERAGE, LIQUIDITY, SOURCE OF FUNDS (3 points) ---
-            
-            # 5. Lower Leverage (Long Term Debt / Avg Assets) < Prev Year
-            # 5. Lower Leverage (Long Term Debt / Avg Assets) < Prev Year
-            lt_debt = get_val(balance_sheet, 'Long Term Debt', t)
-            lt_debt_prev = get_val(balance_sheet, 'Long Term Debt', t_1)
+            t, t_1 = _latest_two(financials.columns)  # Current Year, Previous Year
             
-            leverage = lt_debt / avg_assets if avg_assets else 0
-            leverage_prev = lt_debt_prev / total_assets_prev if total_assets_prev else 0
+            # yfinance often lists a latest year that has no figures yet; don't score it as all zeros
+            if (financials[t].isna().all()
+                    or balance_sheet.reindex(columns=[t]).isna().to_numpy().all()):
+                return {'score': 0, 'details': {}}
             
-            if leverage <= leverage_prev:
-                score += 1
-                details['Lower Leverage'] = True
-            else:
-                details['Lower Leverage'] = False
-                
-            # 6. Higher Current Ratio
-            # 6. Higher Current Ratio
-            curr_assets = get_val(balance_sheet, 'Current Assets', t)
-            curr_liab = get_val(balance_sheet, 'Current Liabilities', t)
-            curr_ratio = curr_assets / curr_liab if curr_liab else 0
-            
-            curr_assets_prev = get_val(balance_sheet, 'Current Assets', t_1)
-            curr_liab_prev = get_val(balance_sheet, 'Current Liabilities', t_1)
-            curr_ratio_prev = curr_assets_prev / curr_liab_prev if curr_liab_prev else 0
-            
-            if curr_ratio > curr_ratio_prev:
-                score += 1
-                details['Higher Liquidity (Current Ratio)'] = True
-            else:
-                details['Higher Liquidity (Current Ratio)'] = False
-
-            # 7. No New Shares (Dilution Check)
+            # Pull every needed row once as [current, previous] columns (missing/NaN -> 0)
+            net_income, revenue, gross_profit = _statement_rows(financials, PIOTROSKI_FIN_ROWS, [t, t_1])
+            (total_assets, lt_debt, curr_assets, curr_liab,
+             ord_shares, common_stock) = _statement_rows(balance_sheet, PIOTROSKI_BS_ROWS, [t, t_1])
+            (ocf,) = _statement_rows(cash_flow, PIOTROSKI_CF_ROWS, [t, t_1])
+            
+            # Current year is scaled by average assets, previous year by its own total assets
+            total_assets_now = total_assets[0] or 1 # Avoid div by zero
+            total_assets_prev = total_assets[1] or total_assets_now
+            avg_assets = (total_assets_now + total_assets_prev) / 2
+            assets = np.array([avg_assets, total_assets_prev])
+            
+            roa = _safe_div(net_income, assets)
+            leverage = _safe_div(lt_debt, assets)             # Long Term Debt / Assets
+            asset_turnover = _safe_div(revenue, assets)
+            curr_ratio = _safe_div(curr_assets, curr_liab)
+            gross_margin = _safe_div(gross_profit, revenue)
             # Hard to get exact shares issued from standard bs/cf, use Ord Shares check or Common Stock
-            # 7. No New Shares (Dilution Check)
-            shares = get_val(balance_sheet, 'Ordinary Shares Number', t) or get_val(balance_sheet, 'Common Stock', t)
-            shares_prev = get_val(balance_sheet, 'Ordinary Shares Number', t_1) or get_val(balance_sheet, 'Common Stock', t_1)
-            
-            if shares <= shares_prev: # No dilution
-                score += 1
-                details['No Dilution'] = True
-            else:
-                details['No Dilution'] = False
-                
-            # --- OPERATING EFFICIENCY (2 points) ---
-            
-            # 8. Higher Gross Margin
-            # 8. Higher Gross Margin
-            revenue = get_val(financials, 'Total Revenue', t)
-            gross_profit = get_val(financials, 'Gross Profit', t)
-            gm = gross_profit / revenue if revenue else 0
-            
-            revenue_prev = get_val(financials, 'Total Revenue', t_1)
-            gross_profit_prev = get_val(financials, 'Gross Profit', t_1)
-            gm_prev = gross_profit_prev / revenue_prev if revenue_prev else 0
-            
-            if gm > gm_prev:
-                score += 1
-                details['Higher Gross Margin'] = True
-            else:
-                details['Higher Gross Margin'] = False
-                
-            # 9. Higher Asset Turnover
-            asset_turnover = revenue / avg_assets if avg_assets else 0
-            asset_turnover_prev = revenue_prev / total_assets_prev if total_assets_prev else 0
-            
-            if asset_turnover > asset_turnover_prev:
-                score += 1
-                details['Higher Asset Turnover'] = True
-            else:
-                details['Higher Asset Turnover'] = False
+            shares = np.where(ord_shares != 0, ord_shares, common_stock)
+            
+            # Same order as PIOTROSKI_CRITERIA
+            signals = np.array([
+                # --- PROFITABILITY (4 points) ---
+                roa[0] > 0,                              # 1. ROA > 0
+                ocf[0] > 0,                              # 2. Operating Cash Flow > 0
+                roa[0] > roa[1],                         # 3. ROA Increasing
+                ocf[0] > net_income[0],                  # 4. Accruals (OCF > Net Income)
+                # --- LEVERAGE, LIQUIDITY, SOURCE OF FUNDS (3 points) ---
+                leverage[0] <= leverage[1],              # 5. Lower Leverage
+                curr_ratio[0] > curr_ratio[1],           # 6. Higher Current Ratio
+                shares[0] <= shares[1],                  # 7. No New Shares (Dilution Check)
+                # --- OPERATING EFFICIENCY (2 points) ---
+                gross_margin[0] > gross_margin[1],       # 8. Higher Gross Margin
+                asset_turnover[0] > asset_turnover[1],   # 9. Higher Asset Turnover
+            ])
+            
+            score = int(signals.sum())
+            details = dict(zip(PIOTROSKI_CRITERIA, signals.tolist()))
                 
         except Exception as e:
             print(f"Error calculating Piotroski Score: {e}")
@@ -163,10 +122,9 @@ class FundamentalIndicators:
         Returns a percentage value (e.g., 15.5 for 15.5%)
         """
         try:
-            # Sort columns to ensure we get appropriate year
-            cols = sorted(financials.columns, reverse=True)
-            if not cols: return 0
-            t = cols[0]
+            # Latest year column (no full sort needed for a single column)
+            if financials.columns.empty: return 0
+            t = financials.columns.max()
 
             # Helper for safe extraction (re-used logic)
             def get_val(df, row, col):
@@ -203,25 +161,26 @@ class FundamentalIndicators:
             if financials.empty or balance_sheet.empty:
                 return {'score': 0, 'zone': 'Unknown'}
 
-            cols = financials.columns
-            t = cols[0]
-            
-            total_assets = balance_sheet.loc['Total Assets', t] if 'Total Assets' in balance_sheet.index else 0
-            if not total_assets: return {'score': 0, 'zone': 'Unknown'}
+            # Latest year column; yfinance does not guarantee column order
+            t = financials.columns.max()
+            
+            # One batched lookup per statement (missing rows and NaN read as NaN)
+            ebit, pretax_income, interest_expense, sales = _statement_rows(financials, ALTMAN_FIN_ROWS, [t], fill=np.nan)[:, 0]
+            (total_assets, curr_assets, curr_liab, retained_earnings,
+             total_liab_nmi, total_liab) = _statement_rows(balance_sheet, ALTMAN_BS_ROWS, [t], fill=np.nan)[:, 0]
+            
+            # Total assets and EBIT (or Pretax Income) are required; without them there is no score
+            if np.isnan(ebit):
+                ebit = pretax_income + np.nan_to_num(interest_expense)
+            if np.isnan(total_assets) or not total_assets or np.isnan(ebit):
+                return {'score': 0, 'zone': 'Unknown'}
             
-            curr_assets = balance_sheet.loc['Current Assets', t] if 'Current Assets' in balance_sheet.index else 0
-            curr_liab = balance_sheet.loc['Current Liabilities', t] if 'Current Liabilities' in balance_sheet.index else 0
+            # The remaining rows are optional and count as 0 when missing
+            curr_assets, curr_liab, retained_earnings, sales = np.nan_to_num(
+                [curr_assets, curr_liab, retained_earnings, sales])
             working_capital = curr_assets - curr_liab
             
-            retained_earnings = balance_sheet.loc['Retained Earnings', t] if 'Retained Earnings' in balance_sheet.index else 0
-            
-            ebit = financials.loc['EBIT', t] if 'EBIT' in financials.index else (
-                   financials.loc['Pretax Income', t] + financials.loc['Interest Expense', t] if 'Interest Expense' in financials.index else financials.loc['Pretax Income', t])
-            
-            total_liab = balance_sheet.loc['Total Liabilities Net Minority Interest', t] if 'Total Liabilities Net Minority Interest' in balance_sheet.index else (
-                         balance_sheet.loc['Total Liabilities', t] if 'Total Liabilities' in balance_sheet.index else 0)
-            
-            sales = financials.loc['Total Revenue', t] if 'Total Revenue' in financials.index else 0
+            total_liab = total_liab_nmi if not np.isnan(total_liab_nmi) else np.nan_to_num(total_liab)
             
             # Components
             A = working_capital / total_assets
@@ -11,38 +11,42 @@ def calculate_reverse_dcf(current_price, free_cash_flow, shares_outstanding, dis
         
     fcf_per_share = free_cash_flow / shares_outstanding
     
-    # Binary search for the growth rate
+    # Newton iteration for the growth rate, kept inside the search bounds
     low = -0.50  # -50% growth
     high = 1.00  # 100% growth
     tolerance = 0.01 # 1 cent
+    step = 1e-6 # Central-difference step for the derivative
     
-    for _ in range(100): # Max iterations
-        mid = (low + high) / 2
-        implied_value = _calculate_dcf_value(fcf_per_share, mid, discount_rate, terminal_growth_rate, projection_years)
+    growth = discount_rate
+    for _ in range(15): # Max iterations
+        implied_value = _calculate_dcf_value(fcf_per_share, growth, discount_rate, terminal_growth_rate, projection_years)
         
         if abs(implied_value - current_price) < tolerance:
-            return mid * 100 # Return as percentage
+            break
         
-        if implied_value < current_price:
-            low = mid
-        else:
-            high = mid
+        slope = (_calculate_dcf_value(fcf_per_share, growth + step, discount_rate, terminal_growth_rate, projection_years)
+                 - _calculate_dcf_value(fcf_per_share, growth - step, discount_rate, terminal_growth_rate, projection_years)) / (2 * step)
+        if slope <= 0:
+            break
+        
+        growth = min(max(growth - (implied_value - current_price) / slope, low), high)
             
-    return mid * 100
+    return growth * 100 # Return as percentage
 
 def _calculate_dcf_value(fcf, growth_rate, discount_rate, terminal_growth_rate, years):
-    total_pv = 0
-    current_fcf = fcf
+    # Closed form of the projection sum: a geometric series in q = (1+g)/(1+r)
+    q = (1 + growth_rate) / (1 + discount_rate)
+    q_n = q ** years
     
     # Projection phase
-    for i in range(1, years + 1):
-        current_fcf = current_fcf * (1 + growth_rate)
-        pv = current_fcf / ((1 + discount_rate) ** i)
-        total_pv += pv
+    if np.isclose(q, 1.0):
+        total_pv = fcf * years
+    else:
+        total_pv = fcf * q * (1 - q_n) / (1 - q)
         
-    # Terminal value
-    terminal_fcf = current_fcf * (1 + terminal_growth_rate)
-    terminal_val = terminal_fcf / (discount_rate - terminal_growth_rate)
-    terminal_pv = terminal_val / ((1 + discount_rate) ** years)
+    # Terminal value (undefined when the discount rate equals the terminal growth rate)
+    if abs(discount_rate - terminal_growth_rate) < 1e-9:
+        return total_pv
+    terminal_pv = fcf * q_n * (1 + terminal_growth_rate) / (discount_rate - terminal_growth_rate)
     
     return total_pv + terminal_pv
@@ -5,51 +5,32 @@ from modules.display_components import (
     display_buffett_analysis,
     display_buy_recommendation,
     display_technical_analysis,
-    display_advanced_metrics
+    display_advanced_metrics,
+    display_neon_chart,
+    build_display_ctx
 )
+from modules.visualizations import create_radar_chart
+
+
+# Hero styles + markup, built once at import. Kept flush-left with no blank lines so the
+# markdown parser passes it through as raw HTML, and compact since it is re-sent every rerun
+# (a rerun drops any element it does not re-emit, so it cannot be sent just once).
+HERO_HTML = """<style>
+.hero-container{padding:20px 20px;text-align:center;background:radial-gradient(circle at center, rgba(0,243,255,0.05) 0%, rgba(0,0,0,0) 70%);margin-bottom:20px;border-bottom:1px solid rgba(255,255,255,0.05);}
+.hero-title{font-size:2.2rem;font-weight:700;background:linear-gradient(90deg, #fff, #8b9bb4);-webkit-background-clip:text;-webkit-text-fill-color:transparent;margin-bottom:5px;letter-spacing:-0.5px;}
+.hero-subtitle{font-size:1rem;color:#64748b;margin-bottom:10px;}
+.dynamic-sub{font-family:var(--font-mono);font-size:0.8rem;color:var(--neon-blue);opacity:0.8;}
+</style>
+<div class="hero-container">
+<h1 class="hero-title">Intelligent Stock Analysis</h1>
+<p class="hero-subtitle">Institutional-grade valuation & fundamentals at your fingertips</p>
+<div class="dynamic-sub">Find stock fundamentals of India, USA, UK, Canada, Germany, Japan, Australia 🌍</div>
+</div>"""
 
 
 def main():
     # Professional Hero Section
-    st.markdown("""
-    <style>
-    .hero-container {
-        padding: 20px 20px; /* Reduced padding */
-        text-align: center;
-        background: radial-gradient(circle at center, rgba(0,243,255,0.05) 0%, rgba(0,0,0,0) 70%); /* Subtler gradient */
-        margin-bottom: 20px;
-        border-bottom: 1px solid rgba(255,255,255,0.05);
-    }
-    .hero-title {
-        font-size: 2.2rem; /* Reduced from 3rem */
-        font-weight: 700;
-        background: linear-gradient(90deg, #fff, #8b9bb4);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin-bottom: 5px;
-        letter-spacing: -0.5px;
-    }
-    .hero-subtitle {
-        font-size: 1rem;
-        color: #64748b;
-        margin-bottom: 10px;
-    }
-    .dynamic-sub {
-        font-family: var(--font-mono);
-        font-size: 0.8rem;
-        color: var(--neon-blue);
-        opacity: 0.8;
-    }
-    </style>
-    
-    <div class="hero-container">
-        <h1 class="hero-title">Intelligent Stock Analysis</h1>
-        <p class="hero-subtitle">Institutional-grade valuation & fundamentals at your fingertips</p>
-        <div class="dynamic-sub">
-            Find stock fundamentals of India, USA, UK, Canada, Germany, Japan, Australia 🌍
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(HERO_HTML, unsafe_allow_html=True)
 
     col1, col2 = st.columns([4, 1])
     # Initialize session state for robust search box handling
@@ -116,25 +97,25 @@ def main():
                 return
 
             # === DISPLAY RESULTS ===
-            display_stock_info(stock_data)
+            # Symbol/market/currency resolved once and shared by the renderers
+            ctx = build_display_ctx(stock_data)
+            display_stock_info(stock_data, ctx)
             
             # Analyze stock FIRST to get result
             result = st.session_state.analyzer.analyze_stock(stock_data)
             
             # Phase 2: Neon Chart
-            from modules.display_components import display_neon_chart
             display_neon_chart(stock_data)
 
             # Radar Chart
             st.markdown("### 🕸️ 5-Point Health Check")
-            from modules.visualizations import create_radar_chart
             radar_fig = create_radar_chart(result)
             st.plotly_chart(radar_fig, use_container_width=True)
 
             display_buffett_analysis(result)
             display_advanced_metrics(result)
             
-            display_buy_recommendation(result)
+            display_buy_recommendation(result, ctx)
             display_technical_analysis(stock_data)
 
 if __name__ == "__main__":
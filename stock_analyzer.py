@@ -1,158 +1,658 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+import functools
+from collections import ChainMap
+from typing import Dict, List, Any, Tuple
 import yfinance as yf
 from datetime import datetime, timedelta
+from numpy.lib.stride_tricks import sliding_window_view
+import streamlit as st
 from modules.fundamental_indicators import FundamentalIndicators
 
+def _compute_advanced_metrics(financials: pd.DataFrame, balance_sheet: pd.DataFrame, cash_flow: pd.DataFrame, market_cap: float) -> Dict[str, Any]:
+    """Piotroski F-Score, ROIC and Altman Z-Score from the raw statements"""
+    indicators = FundamentalIndicators()
+    return {
+        'piotroski': indicators.get_piotroski_f_score(financials, balance_sheet, cash_flow),
+        'roic': indicators.get_roic(financials, balance_sheet),
+        'altman_z': indicators.get_altman_z_score(financials, balance_sheet, market_cap)
+    }
+
+class _EmptyHistory(Exception):
+    """Raised so that empty (possibly failed) history downloads are not cached"""
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _fetch_price_history(symbol: str) -> pd.DataFrame:
+    """1Y daily history for symbols whose stock_data arrived without one (Cached for 15 minutes)"""
+    hist = yf.Ticker(symbol).history(period="1y")
+    if hist.empty:
+        raise _EmptyHistory(symbol)
+    return hist
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _cached_advanced_metrics(symbol: str, report_date: str, market_cap: float,
+                             _financials: pd.DataFrame, _balance_sheet: pd.DataFrame, _cash_flow: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Advanced metrics memoized per (symbol, latest report date, market cap).
+    The statements themselves are not hashed: for a given symbol and report date they are the same filing.
+    """
+    return _compute_advanced_metrics(_financials, _balance_sheet, _cash_flow, market_cap)
+
+# The 16-point Buffett criteria, in display order (shared, read-only)
+BUFFETT_CRITERIA: Tuple[Dict[str, Any], ...] = (
+    {
+        'name': 'Return on Equity (ROE)',
+        'key': 'roe',
+        'criteria': '> 15% = Good, < 10% = Avoid',
+        'good_threshold': 15,
+        'bad_threshold': 10
+    },
+    {
+        'name': 'Debt-to-Equity Ratio',
+        'key': 'debt_to_equity',
+        'criteria': '< 0.5 = Excellent, 0.5-1 = Okay, > 1 = Avoid',
+        'excellent_threshold': 0.5,
+        'avoid_threshold': 1.0
+    },
+    {
+        'name': 'Current Ratio',
+        'key': 'current_ratio',
+        'criteria': '> 1.5 = Healthy, < 1 = Risky',
+        'good_threshold': 1.5,
+        'bad_threshold': 1.0
+    },
+    {
+        'name': 'Book Value Per Share',
+        'key': 'book_value_check',
+        'criteria': 'Stock Price < Book Value',
+        'comparison': 'price_vs_book'
+    },
+    {
+        'name': 'Price-to-Earnings (P/E) Ratio',
+        'key': 'pe_ratio',
+        'criteria': '10-15 = Fair, 15-25 = Okay, > 25 = Expensive',
+        'fair_min': 10,
+        'fair_max': 15,
+        'okay_max': 25
+    },
+    {
+        'name': 'Price-to-Book (P/B) Ratio',
+        'key': 'pb_ratio',
+        'criteria': '< 1.5 = Undervalued',
+        'good_threshold': 1.5
+    },
+    {
+        'name': 'Intrinsic Value vs Market Price',
+        'key': 'intrinsic_value_check',
+        'criteria': 'MoS ≥ 20% (IV=Intrinsic Value via DCF, MoS=Margin of Safety)',
+        'discount_threshold': 20
+    },
+    {
+        'name': 'Operating Profit Margin (OPM)',
+        'key': 'operating_margin',
+        'criteria': '> 15% and stable',
+        'good_threshold': 15
+    },
+    {
+        'name': 'Revenue vs Profit Growth',
+        'key': 'growth_alignment',
+        'criteria': 'Both positive (5-year CAGR or YoY)',
+        'alignment_threshold': 0.8
+    },
+    {
+        'name': 'Return on Capital Employed (ROCE)',
+        'key': 'roce',
+        'criteria': '> 15%',
+        'good_threshold': 15
+    },
+    {
+        'name': 'PEG Ratio',
+        'key': 'peg_ratio',
+        'criteria': '< 1.0',
+        'good_threshold': 1.0
+    },
+    {
+        'name': 'Earnings Growth',
+        'key': 'earnings_growth',
+        'criteria': '> 8-10% CAGR',
+        'good_threshold': 8
+    },
+    {
+        'name': 'Consistent Earnings',
+        'key': 'earnings_consistency',
+        'criteria': 'Net Income stable over 5-10 years',
+        'volatility_threshold': 0.3
+    },
+    {
+        'name': 'Free Cash Flow',
+        'key': 'free_cash_flow',
+        'criteria': 'Positive & growing over 5 years',
+        'growth_threshold': 0
+    },
+    {
+        'name': 'Dividend History',
+        'key': 'dividend_history',
+        'criteria': 'Dividend paid last 5 years (bonus)',
+        'years_threshold': 3
+    }
+)
+
+# Map common currencies to symbols (unknown codes are shown as the code itself)
+CURRENCY_SYMBOLS = {'INR': '₹', 'USD': '$', 'EUR': '€', 'GBP': '£', 'JPY': '¥', 'CNY': '¥'}
+
+# --- Criterion handlers: (value, stock_data, criterion) -> (passed, status, display value) ---
+
+def _eval_roe(value, stock_data, criterion):
+    passed, status = False, "poor"
+    if isinstance(value, (int, float)):
+        if value > criterion['good_threshold']:
+            passed = True
+            status = "good"
+        elif value > criterion['bad_threshold']:
+            status = "caution"
+        value = f"{value:.2f}%"
+    return passed, status, value
+
+def _eval_debt_to_equity(value, stock_data, criterion):
+    passed, status = False, "poor"
+    if isinstance(value, (int, float)):
+        if value < criterion['excellent_threshold']:
+            passed = True
+            status = "good"
+        elif value <= criterion['avoid_threshold']:
+            status = "caution"
+        value = f"{value:.2f}"
+    return passed, status, value
+
+def _eval_current_ratio(value, stock_data, criterion):
+    passed, status = False, "poor"
+    if isinstance(value, (int, float)):
+        if value > criterion['good_threshold']:
+            passed = True
+            status = "good"
+        elif value >= criterion['bad_threshold']:
+            status = "caution"
+        value = f"{value:.2f}"
+    return passed, status, value
+
+def _eval_book_value_check(value, stock_data, criterion):
+    book_value = stock_data.get('book_value', 0) or 0
+    current_price = stock_data.get('current_price', 0) or 0
+    curr_symbol = stock_data['_curr_symbol']
+    if book_value > 0:
+        passed = current_price < book_value
+        # Display actual book value vs current price
+        return passed, "good" if passed else "poor", f"{curr_symbol}{book_value:,.2f} (Price: {curr_symbol}{current_price:,.2f})"
+    return False, "poor", "N/A"
+
+def _eval_pe_ratio(value, stock_data, criterion):
+    passed, status = False, "poor"
+    pe_value = stock_data.get('pe_ratio', 0)
+    if isinstance(pe_value, (int, float)) and pe_value > 0:
+        if criterion['fair_min'] <= pe_value <= criterion['fair_max']:
+            passed = True
+            status = "good"
+        elif pe_value <= criterion['okay_max']:
+            status = "caution"
+        value = f"{pe_value:.2f}"
+    else:
+        value = "N/A"
+    return passed, status, value
+
+def _eval_pb_ratio(value, stock_data, criterion):
+    passed, status = False, "poor"
+    pb_value = stock_data.get('pb_ratio', 0)
+    if isinstance(pb_value, (int, float)) and pb_value > 0:
+        if pb_value < criterion['good_threshold']:
+            passed = True
+            status = "good"
+        else:
+            status = "caution" if pb_value < 2.0 else "poor"
+        value = f"{pb_value:.2f}"
+    else:
+        value = "N/A"
+    return passed, status, value
+
+def _eval_intrinsic_value_check(value, stock_data, criterion):
+    passed, status = False, "poor"
+    current_price = stock_data.get('current_price', 0)
+    intrinsic_value = stock_data.get('intrinsic_value', 0)
+    curr_symbol = stock_data['_curr_symbol']
+    
+    if current_price > 0 and intrinsic_value > 0:
+        # Margin of Safety = (Intrinsic Value - Market Price) / Intrinsic Value × 100
+        # Positive = undervalued (stock trading below intrinsic value)
+        # Negative = overvalued (stock trading above intrinsic value)
+        margin_of_safety = (1 - (current_price / intrinsic_value)) * 100
+        
+        if margin_of_safety >= criterion['discount_threshold']:
+            passed = True
+            status = "good"
+        elif margin_of_safety > 0:
+            status = "caution"
+        
+        # Clear display: show intrinsic value and margin of safety with explanation
+        if margin_of_safety >= 0:
+            value = f"IV: {curr_symbol}{intrinsic_value:,.2f} | MoS: {margin_of_safety:.1f}% (Undervalued)"
+        else:
+            value = f"IV: {curr_symbol}{intrinsic_value:,.2f} | MoS: {margin_of_safety:.1f}% (Overvalued)"
+    else:
+        value = "N/A"
+    return passed, status, value
+
+def _eval_margin_percent(value, stock_data, criterion):
+    """Operating margin and ROCE: caution within 70% of the threshold"""
+    passed, status = False, "poor"
+    if isinstance(value, (int, float)):
+        if value > criterion['good_threshold']:
+            passed = True
+            status = "good"
+        elif value > criterion['good_threshold'] * 0.7:
+            status = "caution"
+        value = f"{value:.2f}%"
+    return passed, status, value
+
+def _eval_growth_alignment(value, stock_data, criterion):
+    passed, status = False, "poor"
+    revenue_growth = stock_data.get('revenue_growth', 0) or 0
+    profit_growth = stock_data.get('earnings_growth', 0) or 0
+    years = stock_data.get('revenue_growth_years', 0) or stock_data.get('earnings_growth_years', 0)
+    
+    # Pass if both are positive (Growth is happening)
+    if revenue_growth > 0 and profit_growth > 0:
+        passed = True
+        status = "good"
+        
+        # Check alignment for "Excellent" vs "Good" status (optional refinement)
+        # If one is growing much faster than the other (e.g. > 2x difference), mark as caution but still PASS
+        alignment_ratio = min(revenue_growth, profit_growth) / max(revenue_growth, profit_growth)
+        if alignment_ratio < 0.5:
+            status = "caution"  # Still passed, but caution flag
+    
+    # Format display with actual growth percentages
+    rev_sign = "+" if revenue_growth >= 0 else ""
+    profit_sign = "+" if profit_growth >= 0 else ""
+    
+    # Check if we have real data
+    if years > 1:
+        # Multi-year CAGR
+        period_text = f" ({years}Y CAGR)"
+    elif years == 1:
+        # One year data
+        period_text = " (YoY)"
+    else:
+        period_text = " (Est)"
+
+    if years > 0 or revenue_growth != 0 or profit_growth != 0:
+        value = f"Rev: {rev_sign}{revenue_growth:.1f}% | Profit: {profit_sign}{profit_growth:.1f}%{period_text}"
+    else:
+        # No data available
+        value = "N/A (Data not available)"
+        status = "caution"
+    return passed, status, value
+
+def _eval_earnings_consistency(value, stock_data, criterion):
+    passed, status = False, "poor"
+    income_history = stock_data.get('net_income_history', [])
+    currency = stock_data.get('currency', 'INR')
+    
+    if income_history and len(income_history) >= 2:
+        # History is usually latest first, reverse to show chronological trend
+        trend_values = income_history[::-1]
+        
+        # Check 1: Are all years positive? (No losses)
+        all_positive = all(val > 0 for val in trend_values)
+        
+        # Check 2: Stability/Growth (Simple check: Latest > Oldest or generally increasing)
+        # For "Consistency", main criteria is usually predictability and no losses.
+        # User asked: "if net income stable, if not failed"
+        if all_positive:
+            passed = True
+            status = "good"
+            
+            # Optional: Check if volatile (Standard Deviation / Mean > 0.5?)
+            # For now, just passing on no losses is a good baseline for "Consistency"
+        else:
+            status = "poor"  # Failed if losses exist
+        
+        # Format for display: Show simplified numbers (e.g. 1.2B, 500Cr)
+        formatted_trend = []
+        for val in trend_values:
+            # Auto-scale
+            abs_val = abs(val)
+            if abs_val >= 1e9: # Billion
+                v_str = f"{val/1e9:.1f}B"
+            elif abs_val >= 1e7: # Crore (India specific preference often mixed, but stick to B/M or Cr/L based on currency?)
+                # Use Cr for INR, M for others?
+                if currency == 'INR':
+                    v_str = f"{val/1e7:.0f}Cr"
+                else:
+                    v_str = f"{val/1e6:.1f}M"
+            elif abs_val >= 1e6: # Million
+                v_str = f"{val/1e6:.1f}M"
+            else:
+                v_str = f"{val/1e3:.0f}K"
+            formatted_trend.append(v_str)
+        
+        # Show last 3-5 years trend
+        trend_str = " → ".join(formatted_trend[-5:])
+        value = f"{trend_str} ({'Consistent' if all_positive else 'Volatile'})"
+    else:
+        value = "N/A (Insufficient Data)"
+    return passed, status, value
+
+def _eval_peg_ratio(value, stock_data, criterion):
+    passed, status = False, "poor"
+    if isinstance(value, (int, float)) and value != float('inf'):
+        if value < criterion['good_threshold']:
+            passed = True
+            status = "good"
+        elif value < 1.5:
+            status = "caution"
+        value = f"{value:.2f}"
+    else:
+        value = "N/A"
+    return passed, status, value
+
+def _eval_earnings_growth(value, stock_data, criterion):
+    passed, status = False, "poor"
+    earnings_growth = stock_data.get('earnings_growth', 0)
+    if isinstance(earnings_growth, (int, float)):
+        if earnings_growth > criterion['good_threshold']:
+            passed = True
+            status = "good"
+        elif earnings_growth > 0:
+            status = "caution"
+        value = f"{earnings_growth:.2f}%"
+    else:
+        value = "N/A"
+    return passed, status, value
+
+def _eval_free_cash_flow(value, stock_data, criterion):
+    if isinstance(value, bool):
+        return value, "good" if value else "poor", "Positive" if value else "Negative"
+    return False, "poor", value
+
+def _eval_dividend_history(value, stock_data, criterion):
+    if isinstance(value, bool):
+        return value, "good" if value else "caution", "Yes" if value else "No"  # Not mandatory
+    return False, "poor", value
+
+# Criterion key -> handler, built once at import
+CRITERION_HANDLERS = {
+    'roe': _eval_roe,
+    'debt_to_equity': _eval_debt_to_equity,
+    'current_ratio': _eval_current_ratio,
+    'book_value_check': _eval_book_value_check,
+    'pe_ratio': _eval_pe_ratio,
+    'pb_ratio': _eval_pb_ratio,
+    'intrinsic_value_check': _eval_intrinsic_value_check,
+    'operating_margin': _eval_margin_percent,
+    'roce': _eval_margin_percent,
+    'growth_alignment': _eval_growth_alignment,
+    'earnings_consistency': _eval_earnings_consistency,
+    'peg_ratio': _eval_peg_ratio,
+    'earnings_growth': _eval_earnings_growth,
+    'free_cash_flow': _eval_free_cash_flow,
+    'dividend_history': _eval_dividend_history,
+}
+
+# Buffett DCF parameters
+DCF_PROJECTION_YEARS = 10  # Standard 10-year projection
+# Discount rate: 10-year Treasury (~4.5%) + Equity Risk Premium (~5%) = ~9.5%
+# Use 10% as a conservative round number (Buffett typically uses 10-12%)
+DCF_DISCOUNT_RATE = 0.10
+# Terminal growth rate (perpetual growth, typically 2-3% = GDP growth)
+DCF_TERMINAL_GROWTH_RATE = 0.025  # 2.5%
+
+# The parameters are fixed, so the year fractions and discount factors are tabulated once
+_DCF_YEAR_FRACTIONS = np.arange(1, DCF_PROJECTION_YEARS + 1) / DCF_PROJECTION_YEARS
+_DCF_DISCOUNT_FACTORS = (1 + DCF_DISCOUNT_RATE) ** np.arange(1, DCF_PROJECTION_YEARS + 1)
+_DCF_TERMINAL_DISCOUNT = float(_DCF_DISCOUNT_FACTORS[-1])
+
+@functools.lru_cache(maxsize=1024)
+def _buffett_dcf_value(free_cash_flow: float, fcf_growth_rate: float) -> float:
+    """
+    Whole-company DCF value: 10 years of FCF with growth fading linearly to the terminal rate,
+    plus a Gordon-growth terminal value. Memoized, since reruns value the same stock repeatedly.
+    """
+    # Project FCF for all years at once and discount each to present value
+    # Growth rate declines linearly to terminal growth rate
+    year_growth = fcf_growth_rate - (fcf_growth_rate - DCF_TERMINAL_GROWTH_RATE) * _DCF_YEAR_FRACTIONS
+    projected = free_cash_flow * np.cumprod(1 + year_growth)
+    total_present_value = float((projected / _DCF_DISCOUNT_FACTORS).sum())
+    projected_fcf = float(projected[-1])
+    
+    # Calculate Terminal Value (Gordon Growth Model)
+    # Terminal Value = FCF_n × (1 + g) / (r - g)
+    terminal_fcf = projected_fcf * (1 + DCF_TERMINAL_GROWTH_RATE)
+    terminal_value = terminal_fcf / (DCF_DISCOUNT_RATE - DCF_TERMINAL_GROWTH_RATE)
+    
+    # Discount terminal value to present
+    terminal_pv = terminal_value / _DCF_TERMINAL_DISCOUNT
+    
+    # Total intrinsic value = PV of projected FCFs + PV of Terminal Value
+    return total_present_value + terminal_pv
+
+# --- Technical indicator kernels: arrays in, arrays out (NaN until the first full window) ---
+
+def _rolling(values: np.ndarray, window: int, reducer, **kwargs) -> np.ndarray:
+    """reducer over each trailing window, NaN-padded to len(values) like Series.rolling(window)"""
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = reducer(sliding_window_view(values, window), axis=1, **kwargs)
+    return out
+
+def _ewm(values: np.ndarray, span: int) -> np.ndarray:
+    """Exponential moving average (adjust=False), as used for EMA and MACD"""
+    return pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+def _wilder_average(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder's smoothing: SMA of the first period values, then avg = (prev * (period - 1) + x) / period"""
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        seeded = values[period - 1:].copy()
+        seeded[0] = values[:period].mean()
+        # The recursion is an adjust=False EMA with alpha = 1/period, i.e. span = 2 * period - 1
+        out[period - 1:] = _ewm(seeded, 2 * period - 1)
+    return out
+
+def _rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Relative Strength Index with Wilder's smoothing of gains and losses"""
+    delta = np.diff(close)
+    gain = _wilder_average(np.where(delta > 0, delta, 0.0), period)
+    loss = _wilder_average(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - (100 / (1 + gain / loss))
+    # The first close has no change before it
+    return np.concatenate(([np.nan], rsi))
+
+def _stochastic(close: np.ndarray, high: np.ndarray, low: np.ndarray, period: int = 14) -> Tuple[np.ndarray, np.ndarray]:
+    """Fast %K and slow %D (3-period SMA of %K)"""
+    low_min = _rolling(low, period, np.min)
+    high_max = _rolling(high, period, np.max)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stoch_k = 100 * ((close - low_min) / (high_max - low_min))
+    return stoch_k, _rolling(stoch_k, 3, np.mean)
+
+def _macd(close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """MACD (12, 26) line and its 9-period signal line"""
+    macd_line = _ewm(close, 12) - _ewm(close, 26)
+    return macd_line, _ewm(macd_line, 9)
+
+def _bollinger_bands(close: np.ndarray, window: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+    """Upper and lower bands at 2 sample standard deviations around the SMA"""
+    sma = _rolling(close, window, np.mean)
+    std = _rolling(close, window, np.std, ddof=1)
+    return sma + (std * 2), sma - (std * 2)
+
+def _compute_technical_indicators(close: np.ndarray, high: np.ndarray, low: np.ndarray, current_price: float) -> Dict[str, Any]:
+    """Latest indicator values, technical score (0-100) and verdict from daily close/high/low arrays"""
+    # Only the latest value of each indicator is scored, so read the array tails directly
+    # --- 1. Moving Averages ---
+    sma_50 = _rolling(close, 50, np.mean)[-1]
+    sma_200 = _rolling(close, 200, np.mean)[-1]
+    # --- 2. RSI ---
+    rsi = _rsi(close)[-1]
+    # --- 3. MACD ---
+    macd, signal = _macd(close)
+    macd_line, signal_line = macd[-1], signal[-1]
+    # --- 4. Bollinger Bands ---
+    upper, lower = _bollinger_bands(close)
+    bb_upper, bb_lower = upper[-1], lower[-1]
+    # --- 5. Stochastic Oscillator ---
+    k, d = _stochastic(close, high, low)
+    stoch_k, stoch_d = k[-1], d[-1]
+    # --- 6. EMAs (Fast Trend) ---
+    ema_9 = _ewm(close, 9)[-1]
+    ema_21 = _ewm(close, 21)[-1]
+    
+    # --- Calculate Technical Score (0-100) ---
+    tech_score = 0
+    signals = []
+    
+    # 1. Long Term Trend (Max 20 pts)
+    if current_price > sma_200:
+        tech_score += 15
+        signals.append("Price > SMA200 (Long Term Bullish)")
+    if current_price > sma_50:
+        tech_score += 5
+    
+    # 2. Fast Trend (EMA Crossover) (Max 20 pts)
+    if ema_9 > ema_21:
+        tech_score += 20
+        signals.append("EMA 9 > EMA 21 (Short Term Bullish)")
+    else:
+        signals.append("EMA 9 < EMA 21 (Short Term Bearish)")
+
+    # 3. RSI (Max 15 pts)
+    if 40 <= rsi <= 70:
+        tech_score += 15
+    elif rsi > 70:
+        tech_score += 5
+        signals.append("RSI Overbought (>70)")
+    elif rsi < 30:
+        tech_score += 10
+        signals.append("RSI Oversold (<30) - Potential Bounce")
+        
+    # 4. MACD (Max 15 pts)
+    if macd_line > signal_line:
+        tech_score += 15
+        signals.append("MACD Bullish Crossover")
+    
+    # 5. Stochastic (Max 15 pts)
+    if stoch_k < 20 and stoch_k > stoch_d:
+        tech_score += 15
+        signals.append("Stochastic Oversold Cross (Buy)")
+    elif stoch_k > 80 and stoch_k < stoch_d:
+         pass # Bearish signal
+    elif stoch_k > stoch_d:
+        tech_score += 10
+    
+    # 6. Bollinger (Max 15 pts)
+    if current_price > bb_lower and current_price < bb_upper:
+        tech_score += 15
+    elif current_price >= bb_upper:
+         tech_score += 10
+         signals.append("Price hitting Upper BB (Momentum)")
+    elif current_price <= bb_lower:
+         tech_score += 5
+         signals.append("Price at Lower BB (Support)")
+
+    # Determine Verdict
+    if tech_score >= 80:
+        verdict = "Strong Bullish"
+        action = "BUY"
+    elif tech_score >= 60:
+        verdict = "Bullish"
+        action = "ACCUMULATE"
+    elif tech_score >= 40:
+        verdict = "Neutral"
+        action = "HOLD"
+    else:
+        verdict = "Bearish"
+        action = "AVOID"
+
+    return {
+        'rsi': round(rsi, 2),
+        'sma_50': round(sma_50, 2),
+        'sma_200': round(sma_200, 2),
+        'macd': round(macd_line, 2),
+        'macd_signal': round(signal_line, 2),
+        'stoch_k': round(stoch_k, 2),
+        'stoch_d': round(stoch_d, 2),
+        'ema_9': round(ema_9, 2),
+        'ema_21': round(ema_21, 2),
+        'bb_upper': round(bb_upper, 2),
+        'bb_lower': round(bb_lower, 2),
+        'technical_score': tech_score,
+        'verdict': verdict,
+        'action': action,
+        'signals': signals,
+        'trend': verdict 
+    }
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _cached_technical_indicators(symbol: str, last_bar: str, n_bars: int, last_close: float, current_price: float,
+                                 _close: np.ndarray, _high: np.ndarray, _low: np.ndarray) -> Dict[str, Any]:
+    """
+    Technical indicators memoized per (symbol, last bar, bar count, last close, price).
+    The arrays themselves are not hashed: for a given key they are the same history.
+    """
+    return _compute_technical_indicators(_close, _high, _low, current_price)
+
 class StockAnalyzer:
     def __init__(self):
-        self.buffett_criteria = self._initialize_buffett_criteria()
+        self.buffett_criteria = BUFFETT_CRITERIA
         self.fundamental_indicators = FundamentalIndicators()
     
-    def _initialize_buffett_criteria(self):
-        """Initialize the 16-point Buffett criteria"""
-        return [
-            {
-                'name': 'Return on Equity (ROE)',
-                'key': 'roe',
-                'criteria': '> 15% = Good, < 10% = Avoid',
-                'good_threshold': 15,
-                'bad_threshold': 10
-            },
-            {
-                'name': 'Debt-to-Equity Ratio',
-                'key': 'debt_to_equity',
-                'criteria': '< 0.5 = Excellent, 0.5-1 = Okay, > 1 = Avoid',
-                'excellent_threshold': 0.5,
-                'avoid_threshold': 1.0
-            },
-            {
-                'name': 'Current Ratio',
-                'key': 'current_ratio',
-                'criteria': '> 1.5 = Healthy, < 1 = Risky',
-                'good_threshold': 1.5,
-                'bad_threshold': 1.0
-            },
-            {
-                'name': 'Book Value Per Share',
-                'key': 'book_value_check',
-                'criteria': 'Stock Price < Book Value',
-                'comparison': 'price_vs_book'
-            },
-            {
-                'name': 'Price-to-Earnings (P/E) Ratio',
-                'key': 'pe_ratio',
-                'criteria': '10-15 = Fair, 15-25 = Okay, > 25 = Expensive',
-                'fair_min': 10,
-                'fair_max': 15,
-                'okay_max': 25
-            },
-            {
-                'name': 'Price-to-Book (P/B) Ratio',
-                'key': 'pb_ratio',
-                'criteria': '< 1.5 = Undervalued',
-                'good_threshold': 1.5
-            },
-            {
-                'name': 'Intrinsic Value vs Market Price',
-                'key': 'intrinsic_value_check',
-                'criteria': 'MoS ≥ 20% (IV=Intrinsic Value via DCF, MoS=Margin of Safety)',
-                'discount_threshold': 20
-            },
-            {
-                'name': 'Operating Profit Margin (OPM)',
-                'key': 'operating_margin',
-                'criteria': '> 15% and stable',
-                'good_threshold': 15
-            },
-            {
-                'name': 'Revenue vs Profit Growth',
-                'key': 'growth_alignment',
-                'criteria': 'Both positive (5-year CAGR or YoY)',
-                'alignment_threshold': 0.8
-            },
-            {
-                'name': 'Return on Capital Employed (ROCE)',
-                'key': 'roce',
-                'criteria': '> 15%',
-                'good_threshold': 15
-            },
-            {
-                'name': 'PEG Ratio',
-                'key': 'peg_ratio',
-                'criteria': '< 1.0',
-                'good_threshold': 1.0
-            },
-            {
-                'name': 'Earnings Growth',
-                'key': 'earnings_growth',
-                'criteria': '> 8-10% CAGR',
-                'good_threshold': 8
-            },
-            {
-                'name': 'Consistent Earnings',
-                'key': 'earnings_consistency',
-                'criteria': 'Net Income stable over 5-10 years',
-                'volatility_threshold': 0.3
-            },
-            {
-                'name': 'Free Cash Flow',
-                'key': 'free_cash_flow',
-                'criteria': 'Positive & growing over 5 years',
-                'growth_threshold': 0
-            },
-            {
-                'name': 'Dividend History',
-                'key': 'dividend_history',
-                'criteria': 'Dividend paid last 5 years (bonus)',
-                'years_threshold': 3
-            }
-        ]
-    
     def analyze_stock(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
         """Perform complete Buffett analysis on a stock"""
         
         # Calculate derived metrics
         derived_metrics = self._calculate_derived_metrics(stock_data)
-        stock_data.update(derived_metrics)
+        
+        # Resolve the display currency symbol once for every criterion that formats money
+        currency = stock_data.get('currency', 'INR')
+        derived_metrics['_curr_symbol'] = CURRENCY_SYMBOLS.get(currency, currency + ' ')
+        
+        # Derived values shadow the raw fields without writing into the caller's stock_data
+        merged = ChainMap(derived_metrics, stock_data)
         
         # Evaluate each criterion
         metrics_results = []
         total_score = 0
         
         for criterion in self.buffett_criteria:
-            result = self._evaluate_criterion(stock_data, criterion)
+            result = self._evaluate_criterion(merged, criterion)
             metrics_results.append(result)
             if result['passed']:
                 total_score += 1
         
         # Generate buy recommendation
-        recommendation = self._generate_recommendation(stock_data, total_score)
+        recommendation = self._generate_recommendation(merged, total_score)
         
         # --- Advanced Fundamentals (Piotroski, Graham, Altman Z) ---
         raw_fin = stock_data.get('raw_financials', pd.DataFrame())
         raw_bs = stock_data.get('raw_balance_sheet', pd.DataFrame())
         raw_cf = stock_data.get('raw_cash_flow', pd.DataFrame())
         
-        piotroski = self.fundamental_indicators.get_piotroski_f_score(raw_fin, raw_bs, raw_cf)
-        
-        # ROIC
-        roic_val = self.fundamental_indicators.get_roic(raw_fin, raw_bs)
-        
         market_cap = stock_data.get('market_cap', 0) or 0
-        altman_z = self.fundamental_indicators.get_altman_z_score(raw_fin, raw_bs, market_cap)
+        
+        # Memoized per filing, so reruns on the same stock skip the statement arithmetic
+        symbol = stock_data.get('symbol')
+        if symbol and not raw_fin.empty:
+            report_date = str(max(raw_fin.columns))
+            advanced_metrics = _cached_advanced_metrics(symbol, report_date, market_cap, raw_fin, raw_bs, raw_cf)
+        else:
+            advanced_metrics = _compute_advanced_metrics(raw_fin, raw_bs, raw_cf, market_cap)
         
         return {
             'total_score': total_score,
             'metrics': metrics_results,
             'recommendation': recommendation,
-            'analysis_timestamp': pd.Timestamp.now(),
-            'advanced_metrics': {
-                'piotroski': piotroski,
-                'roic': roic_val,
-                'altman_z': altman_z
-            }
+            'analysis_timestamp': datetime.now(),
+            'advanced_metrics': advanced_metrics
         }
     
     def _calculate_derived_metrics(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -259,45 +759,12 @@ class StockAnalyzer:
                 # Fallback to simpler EPS-based calculation
                 return self._estimate_intrinsic_value_simple(stock_data)
             
-            # DCF Parameters
-            projection_years = 10  # Standard 10-year projection
-            
-            # Discount rate: 10-year Treasury (~4.5%) + Equity Risk Premium (~5%) = ~9.5%
-            # Use 10% as a conservative round number (Buffett typically uses 10-12%)
-            discount_rate = 0.10
-            
             # Growth rate for FCF projection (use earnings growth, capped at 15%)
             earnings_growth = stock_data.get('earnings_growth', 10) or 10
             fcf_growth_rate = min(earnings_growth / 100, 0.15)  # Cap at 15%
             
-            # Terminal growth rate (perpetual growth, typically 2-3% = GDP growth)
-            terminal_growth_rate = 0.025  # 2.5%
-            
-            # Calculate projected FCF for each year and discount to present value
-            total_present_value = 0
-            projected_fcf = free_cash_flow
-            
-            for year in range(1, projection_years + 1):
-                # Project FCF with declining growth rate
-                # Growth rate declines linearly to terminal growth rate
-                year_growth = fcf_growth_rate - (fcf_growth_rate - terminal_growth_rate) * (year / projection_years)
-                projected_fcf = projected_fcf * (1 + year_growth)
-                
-                # Discount to present value
-                discount_factor = (1 + discount_rate) ** year
-                present_value = projected_fcf / discount_factor
-                total_present_value += present_value
-            
-            # Calculate Terminal Value (Gordon Growth Model)
-            # Terminal Value = FCF_n × (1 + g) / (r - g)
-            terminal_fcf = projected_fcf * (1 + terminal_growth_rate)
-            terminal_value = terminal_fcf / (discount_rate - terminal_growth_rate)
-            
-            # Discount terminal value to present
-            terminal_pv = terminal_value / ((1 + discount_rate) ** projection_years)
-            
             # Total intrinsic value = PV of projected FCFs + PV of Terminal Value
-            total_intrinsic_value = total_present_value + terminal_pv
+            total_intrinsic_value = _buffett_dcf_value(free_cash_flow, fcf_growth_rate)
             
             # Per-share intrinsic value
             intrinsic_value_per_share = total_intrinsic_value / shares_outstanding
@@ -335,264 +802,24 @@ class StockAnalyzer:
         """Evaluate a single Buffett criterion"""
         
         key = criterion['key']
-        name = criterion['name']
-        criteria_text = criterion['criteria']
         
         # Get the value for this criterion
-        if key in stock_data:
-            value = stock_data[key]
-        else:
-            value = "N/A"
+        value = stock_data.get(key, "N/A")
         
-        # Evaluate based on criterion type
+        # Evaluate based on criterion type (unknown keys stay "poor")
         passed = False
         status = "poor"
         
-        if key == 'roe':
-            if isinstance(value, (int, float)):
-                if value > criterion['good_threshold']:
-                    passed = True
-                    status = "good"
-                elif value > criterion['bad_threshold']:
-                    status = "caution"
-                value = f"{value:.2f}%"
-        
-        elif key == 'debt_to_equity':
-            if isinstance(value, (int, float)):
-                if value < criterion['excellent_threshold']:
-                    passed = True
-                    status = "good"
-                elif value <= criterion['avoid_threshold']:
-                    status = "caution"
-                value = f"{value:.2f}"
-        
-        elif key == 'current_ratio':
-            if isinstance(value, (int, float)):
-                if value > criterion['good_threshold']:
-                    passed = True
-                    status = "good"
-                elif value >= criterion['bad_threshold']:
-                    status = "caution"
-                value = f"{value:.2f}"
-        
-        elif key == 'book_value_check':
-            book_value = stock_data.get('book_value', 0) or 0
-            current_price = stock_data.get('current_price', 0) or 0
-            currency = stock_data.get('currency', 'INR')
-            # Map common currencies to symbols
-            currency_symbols = {'INR': '₹', 'USD': '$', 'EUR': '€', 'GBP': '£', 'JPY': '¥', 'CNY': '¥'}
-            curr_symbol = currency_symbols.get(currency, currency + ' ')
-            if book_value > 0:
-                passed = current_price < book_value
-                status = "good" if passed else "poor"
-                # Display actual book value vs current price
-                value = f"{curr_symbol}{book_value:,.2f} (Price: {curr_symbol}{current_price:,.2f})"
-            else:
-                passed = False
-                status = "poor"
-                value = "N/A"
-        
-        elif key == 'pe_ratio':
-            pe_value = stock_data.get('pe_ratio', 0)
-            if isinstance(pe_value, (int, float)) and pe_value > 0:
-                if criterion['fair_min'] <= pe_value <= criterion['fair_max']:
-                    passed = True
-                    status = "good"
-                elif pe_value <= criterion['okay_max']:
-                    status = "caution"
-                value = f"{pe_value:.2f}"
-            else:
-                value = "N/A"
-        
-        elif key == 'pb_ratio':
-            pb_value = stock_data.get('pb_ratio', 0)
-            if isinstance(pb_value, (int, float)) and pb_value > 0:
-                if pb_value < criterion['good_threshold']:
-                    passed = True
-                    status = "good"
-                else:
-                    status = "caution" if pb_value < 2.0 else "poor"
-                value = f"{pb_value:.2f}"
-            else:
-                value = "N/A"
-        
-        elif key == 'intrinsic_value_check':
-            current_price = stock_data.get('current_price', 0)
-            intrinsic_value = stock_data.get('intrinsic_value', 0)
-            currency = stock_data.get('currency', 'INR')
-            currency_symbols = {'INR': '₹', 'USD': '$', 'EUR': '€', 'GBP': '£', 'JPY': '¥', 'CNY': '¥'}
-            curr_symbol = currency_symbols.get(currency, currency + ' ')
-            
-            if current_price > 0 and intrinsic_value > 0:
-                # Margin of Safety = (Intrinsic Value - Market Price) / Intrinsic Value × 100
-                # Positive = undervalued (stock trading below intrinsic value)
-                # Negative = overvalued (stock trading above intrinsic value)
-                margin_of_safety = (1 - (current_price / intrinsic_value)) * 100
-                
-                if margin_of_safety >= criterion['discount_threshold']:
-                    passed = True
-                    status = "good"
-                elif margin_of_safety > 0:
-                    status = "caution"
-                
-                # Clear display: show intrinsic value and margin of safety with explanation
-                if margin_of_safety >= 0:
-                    value = f"IV: {curr_symbol}{intrinsic_value:,.2f} | MoS: {margin_of_safety:.1f}% (Undervalued)"
-                else:
-                    value = f"IV: {curr_symbol}{intrinsic_value:,.2f} | MoS: {margin_of_safety:.1f}% (Overvalued)"
-            else:
-                value = "N/A"
-        
-        elif key in ['operating_margin', 'roce']:
-            if isinstance(value, (int, float)):
-                if value > criterion['good_threshold']:
-                    passed = True
-                    status = "good"
-                elif value > criterion['good_threshold'] * 0.7:
-                    status = "caution"
-                value = f"{value:.2f}%"
-        
-        elif key == 'growth_alignment':
-            revenue_growth = stock_data.get('revenue_growth', 0) or 0
-            profit_growth = stock_data.get('earnings_growth', 0) or 0
-            years = stock_data.get('revenue_growth_years', 0) or stock_data.get('earnings_growth_years', 0)
-            
-            # Pass if both are positive (Growth is happening)
-            if revenue_growth > 0 and profit_growth > 0:
-                passed = True
-                status = "good"
-                
-                # Check alignment for "Excellent" vs "Good" status (optional refinement)
-                # If one is growing much faster than the other (e.g. > 2x difference), mark as caution but still PASS
-                alignment_ratio = min(revenue_growth, profit_growth) / max(revenue_growth, profit_growth)
-                if alignment_ratio < 0.5:
-                    status = "caution"  # Still passed, but caution flag
-            
-            # Format display with actual growth percentages
-            rev_sign = "+" if revenue_growth >= 0 else ""
-            profit_sign = "+" if profit_growth >= 0 else ""
-            
-            # Check if we have real data
-            if years > 1:
-                # Multi-year CAGR
-                period_text = f" ({years}Y CAGR)"
-            elif years == 1:
-                # One year data
-                period_text = " (YoY)"
-            else:
-                period_text = " (Est)"
-
-            if years > 0 or revenue_growth != 0 or profit_growth != 0:
-                value = f"Rev: {rev_sign}{revenue_growth:.1f}% | Profit: {profit_sign}{profit_growth:.1f}%{period_text}"
-            else:
-                # No data available
-                value = "N/A (Data not available)"
-                status = "caution"
-        
-        elif key == 'earnings_consistency':
-            income_history = stock_data.get('net_income_history', [])
-            currency = stock_data.get('currency', 'INR')
-            currency_symbols = {'INR': '₹', 'USD': '$', 'EUR': '€', 'GBP': '£', 'JPY': '¥', 'CNY': '¥'}
-            curr_symbol = currency_symbols.get(currency, currency)
-            
-            if income_history and len(income_history) >= 2:
-                # History is usually latest first, reverse to show chronological trend
-                trend_values = income_history[::-1]
-                
-                # Check 1: Are all years positive? (No losses)
-                all_positive = all(val > 0 for val in trend_values)
-                
-                # Check 2: Stability/Growth (Simple check: Latest > Oldest or generally increasing)
-                # For "Consistency", main criteria is usually predictability and no losses.
-                # User asked: "if net income stable, if not failed"
-                if all_positive:
-                    passed = True
-                    status = "good"
-                    
-                    # Optional: Check if volatile (Standard Deviation / Mean > 0.5?)
-                    # For now, just passing on no losses is a good baseline for "Consistency"
-                else:
-                    status = "poor"  # Failed if losses exist
-                
-                # Format for display: Show simplified numbers (e.g. 1.2B, 500Cr)
-                formatted_trend = []
-                for val in trend_values:
-                    # Auto-scale
-                    abs_val = abs(val)
-                    if abs_val >= 1e9: # Billion
-                        v_str = f"{val/1e9:.1f}B"
-                    elif abs_val >= 1e7: # Crore (India specific preference often mixed, but stick to B/M or Cr/L based on currency?)
-                        # Use Cr for INR, M for others?
-                        if currency == 'INR':
-                            v_str = f"{val/1e7:.0f}Cr"
-                        else:
-                            v_str = f"{val/1e6:.1f}M"
-                    elif abs_val >= 1e6: # Million
-                        v_str = f"{val/1e6:.1f}M"
-                    else:
-                        v_str = f"{val/1e3:.0f}K"
-                    formatted_trend.append(v_str)
-                
-                # Show last 3-5 years trend
-                trend_str = " → ".join(formatted_trend[-5:])
-                value = f"{trend_str} ({'Consistent' if all_positive else 'Volatile'})"
-            else:
-                value = "N/A (Insufficient Data)"
-        
-        elif key == 'peg_ratio':
-            if isinstance(value, (int, float)) and value != float('inf'):
-                if value < criterion['good_threshold']:
-                    passed = True
-                    status = "good"
-                elif value < 1.5:
-                    status = "caution"
-                value = f"{value:.2f}"
-            else:
-                value = "N/A"
-        
-        elif key == 'earnings_growth':
-            earnings_growth = stock_data.get('earnings_growth', 0)
-            if isinstance(earnings_growth, (int, float)):
-                if earnings_growth > criterion['good_threshold']:
-                    passed = True
-                    status = "good"
-                elif earnings_growth > 0:
-                    status = "caution"
-                value = f"{earnings_growth:.2f}%"
-            else:
-                value = "N/A"
-        
-        elif key == 'earnings_consistency':
-            # This would require historical analysis
-            if isinstance(value, (int, float)):
-                if value > 0.6:  # Simplified threshold
-                    passed = True
-                    status = "good"
-                elif value > 0.4:
-                    status = "caution"
-                value = f"{value:.2f}"
-            else:
-                value = "N/A"
-        
-        elif key == 'free_cash_flow':
-            if isinstance(value, bool):
-                passed = value
-                status = "good" if passed else "poor"
-                value = "Positive" if value else "Negative"
-        
-        
-        elif key == 'dividend_history':
-            if isinstance(value, bool):
-                passed = value
-                status = "good" if passed else "caution"  # Not mandatory
-                value = "Yes" if value else "No"
+        handler = CRITERION_HANDLERS.get(key)
+        if handler:
+            passed, status, value = handler(value, stock_data, criterion)
         
         return {
-            'name': name,
+            'name': criterion['name'],
             'value': value,
             'status': status,
             'passed': passed,
-            'criteria': criteria_text
+            'criteria': criterion['criteria']
         }
     
     def _generate_recommendation(self, stock_data: Dict[str, Any], total_score: int) -> Dict[str, Any]:
@@ -642,7 +869,10 @@ class StockAnalyzer:
     
     
     def get_technical_indicators(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate REAL technical indicators using historical data"""
+        """
+        Calculate REAL technical indicators using historical data.
+        stock_data['history'] is only read: indicators are computed on arrays taken from it.
+        """
         
         symbol = stock_data.get('symbol', '')
         current_price = stock_data.get('current_price', 0)
@@ -653,178 +883,25 @@ class StockAnalyzer:
         try:
             # Fetch historical data using yfinance (Reuse from stock_data if available to save calls)
             if 'history' in stock_data and stock_data['history'] is not None and not stock_data['history'].empty:
-                hist_data = stock_data['history'].copy()
-            else:
-                ticker = yf.Ticker(symbol)
-                hist_data = ticker.history(period="1y")
-            
-            if hist_data.empty:
-                return self._get_fallback_indicators(current_price)
-            
-            # --- 1. Moving Averages ---
-            hist_data['SMA_50'] = hist_data['Close'].rolling(window=50).mean()
-            hist_data['SMA_200'] = hist_data['Close'].rolling(window=200).mean()
-            
-            # --- 2. RSI ---
-            hist_data = self._calculate_rsi(hist_data)
-            
-            # --- 3. MACD ---
-            hist_data = self._calculate_macd(hist_data)
-            
-            # --- 4. Bollinger Bands ---
-            hist_data = self._calculate_bollinger_bands(hist_data)
-            
-            # --- 5. Stochastic Oscillator ---
-            hist_data = self._calculate_stochastic(hist_data)
-            
-            # --- 6. EMAs (Fast Trend) ---
-            hist_data['EMA_9'] = hist_data['Close'].ewm(span=9, adjust=False).mean()
-            hist_data['EMA_21'] = hist_data['Close'].ewm(span=21, adjust=False).mean()
-            
-            # Extract Latest Values
-            latest = hist_data.iloc[-1]
-            prev = hist_data.iloc[-2] if len(hist_data) > 1 else latest
-            
-            sma_50 = latest.get('SMA_50', current_price)
-            sma_200 = latest.get('SMA_200', current_price)
-            rsi = latest.get('RSI', 50)
-            macd_line = latest.get('MACD_Line', 0)
-            signal_line = latest.get('Signal_Line', 0)
-            stoch_k = latest.get('Stoch_K', 50)
-            stoch_d = latest.get('Stoch_D', 50)
-            ema_9 = latest.get('EMA_9', current_price)
-            ema_21 = latest.get('EMA_21', current_price)
-            
-            # --- Calculate Technical Score (0-100) ---
-            tech_score = 0
-            signals = []
-            
-            # 1. Long Term Trend (Max 20 pts)
-            if current_price > sma_200:
-                tech_score += 15
-                signals.append("Price > SMA200 (Long Term Bullish)")
-            if current_price > sma_50:
-                tech_score += 5
-            
-            # 2. Fast Trend (EMA Crossover) (Max 20 pts)
-            if ema_9 > ema_21:
-                tech_score += 20
-                signals.append("EMA 9 > EMA 21 (Short Term Bullish)")
+                hist_data = stock_data['history']
             else:
-                signals.append("EMA 9 < EMA 21 (Short Term Bearish)")
-
-            # 3. RSI (Max 15 pts)
-            if 40 <= rsi <= 70:
-                tech_score += 15
-            elif rsi > 70:
-                tech_score += 5
-                signals.append("RSI Overbought (>70)")
-            elif rsi < 30:
-                tech_score += 10
-                signals.append("RSI Oversold (<30) - Potential Bounce")
-                
-            # 4. MACD (Max 15 pts)
-            if macd_line > signal_line:
-                tech_score += 15
-                signals.append("MACD Bullish Crossover")
+                try:
+                    hist_data = _fetch_price_history(symbol)
+                except _EmptyHistory:
+                    return self._get_fallback_indicators(current_price)
             
-            # 5. Stochastic (Max 15 pts)
-            if stoch_k < 20 and stoch_k > stoch_d:
-                tech_score += 15
-                signals.append("Stochastic Oversold Cross (Buy)")
-            elif stoch_k > 80 and stoch_k < stoch_d:
-                 pass # Bearish signal
-            elif stoch_k > stoch_d:
-                tech_score += 10
+            close = hist_data['Close'].to_numpy(dtype=float)
+            high = hist_data['High'].to_numpy(dtype=float)
+            low = hist_data['Low'].to_numpy(dtype=float)
             
-            # 6. Bollinger (Max 15 pts)
-            bb_upper = latest.get('BB_Upper', current_price * 1.1)
-            bb_lower = latest.get('BB_Lower', current_price * 0.9)
-            
-            if current_price > bb_lower and current_price < bb_upper:
-                tech_score += 15
-            elif current_price >= bb_upper:
-                 tech_score += 10
-                 signals.append("Price hitting Upper BB (Momentum)")
-            elif current_price <= bb_lower:
-                 tech_score += 5
-                 signals.append("Price at Lower BB (Support)")
-
-            # Determine Verdict
-            if tech_score >= 80:
-                verdict = "Strong Bullish"
-                action = "BUY"
-            elif tech_score >= 60:
-                verdict = "Bullish"
-                action = "ACCUMULATE"
-            elif tech_score >= 40:
-                verdict = "Neutral"
-                action = "HOLD"
-            else:
-                verdict = "Bearish"
-                action = "AVOID"
-
-            return {
-                'rsi': round(rsi, 2),
-                'sma_50': round(sma_50, 2),
-                'sma_200': round(sma_200, 2),
-                'macd': round(macd_line, 2),
-                'macd_signal': round(signal_line, 2),
-                'stoch_k': round(stoch_k, 2),
-                'stoch_d': round(stoch_d, 2),
-                'ema_9': round(ema_9, 2),
-                'ema_21': round(ema_21, 2),
-                'bb_upper': round(bb_upper, 2),
-                'bb_lower': round(bb_lower, 2),
-                'technical_score': tech_score,
-                'verdict': verdict,
-                'action': action,
-                'signals': signals,
-                'trend': verdict 
-            }
+            # Memoized per history snapshot, so reruns on unchanged bars skip the indicator kernels
+            return _cached_technical_indicators(symbol, str(hist_data.index[-1]), len(close), float(close[-1]),
+                                                current_price, close, high, low)
             
         except Exception as e:
             print(f"Error calculating technical indicators for {symbol}: {e}")
             return self._get_fallback_indicators(current_price)
     
-    def _calculate_rsi(self, data: pd.DataFrame, period: int = 14) -> pd.DataFrame:
-        """Calculate Relative Strength Index"""
-        delta = data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        data['RSI'] = rsi
-        return data
-
-    def _calculate_stochastic(self, data: pd.DataFrame, period: int = 14) -> pd.DataFrame:
-        """Calculate Stochastic Oscillator"""
-        low_min = data['Low'].rolling(window=period).min()
-        high_max = data['High'].rolling(window=period).max()
-        
-        # Fast %K
-        data['Stoch_K'] = 100 * ((data['Close'] - low_min) / (high_max - low_min))
-        # Slow %D (3-period SMA of %K)
-        data['Stoch_D'] = data['Stoch_K'].rolling(window=3).mean()
-        return data
-
-    def _calculate_macd(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Calculate MACD (12, 26, 9)"""
-        exp12 = data['Close'].ewm(span=12, adjust=False).mean()
-        exp26 = data['Close'].ewm(span=26, adjust=False).mean()
-        data['MACD_Line'] = exp12 - exp26
-        data['Signal_Line'] = data['MACD_Line'].ewm(span=9, adjust=False).mean()
-        return data
-
-    def _calculate_bollinger_bands(self, data: pd.DataFrame, window: int = 20) -> pd.DataFrame:
-        """Calculate Bollinger Bands"""
-        sma = data['Close'].rolling(window=window).mean()
-        std = data['Close'].rolling(window=window).std()
-        data['BB_Upper'] = sma + (std * 2)
-        data['BB_Lower'] = sma - (std * 2)
-        return data
-    
     def _get_fallback_indicators(self, current_price: float) -> Dict[str, Any]:
         """Fallback technical indicators when historical data is not available"""
         return {
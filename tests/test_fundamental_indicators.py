@@ -0,0 +1,29 @@
+import pandas as pd
+
+from modules.fundamental_indicators import FundamentalIndicators
+
+
+def _statements(fin_rows: dict, bs_rows: dict):
+    year = pd.Timestamp('2024-12-31')
+    return pd.DataFrame({year: fin_rows}), pd.DataFrame({year: bs_rows})
+
+
+def test_altman_z_score_unknown_without_ebit_or_pretax_income():
+    financials, balance_sheet = _statements(
+        {'Interest Expense': 50.0, 'Total Revenue': 1000.0},
+        {'Total Assets': 800.0, 'Current Assets': 300.0, 'Current Liabilities': 100.0,
+         'Retained Earnings': 200.0, 'Total Liabilities': 400.0},
+    )
+    result = FundamentalIndicators().get_altman_z_score(financials, balance_sheet, market_cap=5000.0)
+    assert result == {'score': 0, 'zone': 'Unknown'}
+
+
+def test_altman_z_score_falls_back_to_pretax_income_plus_interest():
+    financials, balance_sheet = _statements(
+        {'Pretax Income': 150.0, 'Interest Expense': 50.0, 'Total Revenue': 1000.0},
+        {'Total Assets': 1000.0, 'Current Assets': 300.0, 'Current Liabilities': 100.0,
+         'Retained Earnings': 200.0, 'Total Liabilities': 500.0},
+    )
+    result = FundamentalIndicators().get_altman_z_score(financials, balance_sheet, market_cap=1000.0)
+    # 1.2*0.2 + 1.4*0.2 + 3.3*0.2 + 0.6*2.0 + 1.0*1.0
+    assert result == {'score': 3.38, 'zone': 'Safe (Green)'}
@@ -1,5 +1,28 @@
+import re
+from bisect import bisect_right
 import streamlit as st
-from typing import Union
+from typing import Union, Callable, Any
+
+_UNSET = object()
+
+# Valid stock input characters (alphanumeric, dots, hyphens, spaces)
+_STOCK_INPUT_RE = re.compile(r'^[a-zA-Z0-9\.\-\s]+$')
+
+# Large-number scales for format_currency, ascending: (threshold and divisor, suffix)
+_CURRENCY_SCALES = ((1e3, 'K'), (1e5, 'L'), (1e7, 'Cr'), (1e9, 'B'), (1e12, 'T'))
+_CURRENCY_THRESHOLDS = tuple(threshold for threshold, _ in _CURRENCY_SCALES)
+
+class Lazy:
+    """Proxy that builds the wrapped object on first attribute access"""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._value = _UNSET
+
+    def __getattr__(self, name: str) -> Any:
+        if self._value is _UNSET:
+            self._value = self._factory()
+        return getattr(self._value, name)
 
 def format_currency(amount: Union[int, float], currency: str = "₹", is_large: bool = False) -> str:
     """Format currency with appropriate scaling for large numbers"""
@@ -7,17 +30,10 @@ def format_currency(amount: Union[int, float], currency: str = "₹", is_large:
     if amount == 0:
         return f"{currency}0"
     
-    if is_large:
-        if amount >= 1e12:  # Trillion
-            return f"{currency}{amount/1e12:.2f}T"
-        elif amount >= 1e9:  # Billion
-            return f"{currency}{amount/1e9:.2f}B"
-        elif amount >= 1e7:  # Crore
-            return f"{currency}{amount/1e7:.2f}Cr"
-        elif amount >= 1e5:  # Lakh
-            return f"{currency}{amount/1e5:.2f}L"
-        elif amount >= 1e3:  # Thousand
-            return f"{currency}{amount/1e3:.2f}K"
+    # Thousand / Lakh / Crore / Billion / Trillion: the largest scale the amount reaches
+    if is_large and amount >= _CURRENCY_THRESHOLDS[0]:
+        divisor, suffix = _CURRENCY_SCALES[bisect_right(_CURRENCY_THRESHOLDS, amount) - 1]
+        return f"{currency}{amount/divisor:.2f}{suffix}"
     
     return f"{currency}{amount:,.2f}"
 
@@ -61,12 +77,8 @@ def calculate_score_grade(score: int, total: int = 15) -> tuple:
 
 def validate_stock_input(input_text: str) -> bool:
     """Validate stock input format"""
-    if not input_text or len(input_text.strip()) < 2:
+    if not input_text:
         return False
     
-    # Check for valid characters (alphanumeric, dots, hyphens)
-    import re
-    pattern = r'^[a-zA-Z0-9\.\-\s]+$'
-    return bool(re.match(pattern, input_text.strip()))
-
-
+    text = input_text.strip()
+    return len(text) >= 2 and _STOCK_INPUT_RE.match(text) is not None